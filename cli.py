@@ -1,7 +1,8 @@
 import argparse
+import functools
 import os
 import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import dotenv
@@ -12,27 +13,52 @@ from rich.text import Text  # For styled text
 
 console = Console()
 
-# --- Import your existing modules ---
-# You will need to ensure these modules are importable from this script's location.
-try:
-    from llm.generate_daily_reports import ReportGenerator
-    from llm.llm_chat import llm_chat
-    from llm.process_articles import ArticleProcessor
-    from scrapers.sports_news_scraper import scrape_news
-    from scrapers.stats_scraper import scrape_stats
-    from storage.db_store import DBStore
-    from storage.vector_store import VectorStoreManager
-except ImportError as e:
+CONFIG_PATH = Path(".env")
+
+# Parsed .env values, refreshed only when the file's mtime changes.
+_env_cache = {"mtime": 0, "vals": {}}
+
+
+def get_env(key: str, default=None):
+    """Returns a config value from the cached .env, falling back to the process environment."""
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return os.environ.get(key, default)
+    if mtime != _env_cache["mtime"]:
+        _env_cache["vals"] = dotenv.dotenv_values(CONFIG_PATH)
+        _env_cache["mtime"] = mtime
+    value = _env_cache["vals"].get(key)
+    return value if value is not None else os.environ.get(key, default)
+
+
+# --- Pipeline modules are imported lazily ---
+# They pull in LangChain, Selenium, FAISS etc., so each action imports only what it
+# needs when it runs and menu-only sessions start instantly.
+def report_import_error(e: ImportError):
+    """Reports a pipeline module that failed to import."""
     console.print(f"[red]❌ Failed to import required modules: {e}[/red]")
     console.print(
         "Make sure all your modules are accessible and dependencies are installed."
     )
-    sys.exit(1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_article_processor(language: str):
+    """Returns the shared ArticleProcessor for the given language."""
+    from llm.process_articles import ArticleProcessor
+
+    return ArticleProcessor(language=language)
+
+
+def pause():
+    """Waits for the user to acknowledge the output before returning to the menu."""
+    console.input("[dim]Press Enter to continue...[/dim]")
 
 
 def display_main_menu():
     """Display the main menu and get user choice."""
-    console.clear()
+    console.rule()
     console.print("\n[bold blue]Sports News Pipeline CLI[/bold blue]")
     console.print("1. Configuration")
     console.print("2. Individual Modules")
@@ -47,7 +73,7 @@ def display_main_menu():
 
 
 def display_generate_reports_menu():
-    console.clear()
+    console.rule()
     console.print("\n[bold blue]Generate Reports Options:[/bold blue]")
     console.print("1. Generate All")
     console.print("2. Generate Specific Date")
@@ -62,7 +88,7 @@ def display_generate_reports_menu():
 
 
 def display_process_articles_menu():
-    console.clear()
+    console.rule()
     console.print("\n[bold blue]Process Articles Options:[/bold blue]")
     console.print("1. Process Specific")
     console.print("2. Process All")
@@ -77,7 +103,7 @@ def display_process_articles_menu():
 
 
 def display_vectorstore_menu():
-    console.clear()
+    console.rule()
     console.print("\n[bold blue]VectorStore Options:[/bold blue]")
     console.print("1. Create/Update")
     console.print("2. Query")
@@ -93,7 +119,7 @@ def display_vectorstore_menu():
 
 
 def display_individual_modules_menu():
-    console.clear()
+    console.rule()
     console.print("\n[bold blue]Individual Modules:[/bold blue]")
     console.print("1. DBStore")
     console.print("2. VectorStore")
@@ -113,7 +139,7 @@ def display_individual_modules_menu():
 
 def load_config_file() -> Path:
     """Load the .env file path."""
-    config_path = Path(".env")
+    config_path = CONFIG_PATH
     if not config_path.exists():
         console.print(
             f"[yellow]⚠️  Config file {config_path} not found. Creating a default one...[/yellow]"
@@ -144,6 +170,7 @@ def edit_config_file():
         console.print("\n[green]✅ Configuration file saved.[/green]")
         # Reload environment variables after editing
         dotenv.load_dotenv(dotenv_path=config_path, override=True)
+        _env_cache["mtime"] = 0
         console.print("[green]✅ Environment variables reloaded.[/green]")
     except subprocess.CalledProcessError as e:
         console.print(f"\n[red]❌ Error opening editor or saving file: {e}[/red]")
@@ -156,36 +183,46 @@ def edit_config_file():
 
 
 def run_dbstore():
-    console.clear()
+    console.rule()
     console.print("--- Running DBStore ---")
     try:
-        store = DBStore()
+        from storage.db_store import get_db_store
+
+        store = get_db_store()
         store.run()
         console.print("--- DBStore Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in DBStore: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_vectorstore_create_update():
-    console.clear()
+    console.rule()
     console.print("--- Creating/Updating Vector Store ---")
     try:
-        manager = VectorStoreManager()
+        from storage.vector_store import get_vector_store
+
+        manager = get_vector_store()
         manager.sync()
         manager.create_or_update(days_back=30)
         console.print("--- VectorStore Create/Update Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in VectorStore Create/Update: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_vectorstore_query():
-    console.clear()
+    console.rule()
     console.print("--- Querying VectorStore ---")
     query = Prompt.ask("[bold blue]Query[/bold blue]")
     try:
-        manager = VectorStoreManager()
+        from storage.vector_store import get_vector_store
+
+        manager = get_vector_store()
         search_results = manager.query(query, k=3)
         console.print("\n" + "=" * 50)
         console.print("Query Results:")
@@ -206,86 +243,112 @@ def run_vectorstore_query():
         else:
             console.print("\n🤷 No results found for the query.")
         console.print("\n" + "=" * 50)
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in VectorStore Query: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_vectorstore_clear():
-    console.clear()
+    console.rule()
     console.print("--- Clearing VectorStore ---")
     try:
-        manager = VectorStoreManager()
+        from storage.vector_store import get_vector_store
+
+        manager = get_vector_store()
         manager.clear()
         console.print("--- VectorStore Cleared ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error clearing VectorStore: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_stats_scraper():
-    console.clear()
+    console.rule()
     console.print("--- Scraping Stats ---")
-    scrape_stats()
-    input("Press Enter to continue...")
+    try:
+        from scrapers.stats_scraper import scrape_stats
+
+        scrape_stats()
+    except ImportError as e:
+        report_import_error(e)
+    pause()
 
 
 def run_news_scraper():
-    console.clear()
+    console.rule()
     console.print("--- Scraping News ---")
-    scrape_news()
-    input("Press Enter to continue...")
+    try:
+        from scrapers.sports_news_scraper import scrape_news
+
+        scrape_news()
+    except ImportError as e:
+        report_import_error(e)
+    pause()
 
 
 def run_process_specific_articles():
-    console.clear()
+    console.rule()
     console.print("--- Processing Specific Article ---")
     file = Path(Prompt.ask("[bold blue]File Name[/bold blue]"))
     try:
-        processor = ArticleProcessor(language=os.getenv("LANGUAGE", "greek"))
+        processor = get_article_processor(get_env("LANGUAGE", "greek"))
         if file.exists():
             processor.evaluate_single_file(file)
         else:
             print(f"❌ Error: File not found at '{file}'")
         console.print("--- Process Article Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Process Article: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_process_all_articles():
-    console.clear()
+    console.rule()
     console.print("--- Processing All Articles ---")
     try:
-        processor = ArticleProcessor(language=os.getenv("LANGUAGE", "greek"))
+        processor = get_article_processor(get_env("LANGUAGE", "greek"))
         processor.process_all_articles_in_parallel()
         console.print("--- Process All Articles Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Process Articles: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_generate_reports_all():
-    console.clear()
+    console.rule()
     console.print("--- Generating All Reports ---")
     try:
+        from llm.generate_daily_reports import ReportGenerator
+
         args = argparse.Namespace(
             all=True, date=None, sport=None, competition=None, method="summaries"
         )
         generator = ReportGenerator(args)
         generator.run()
         console.print("--- Generate All Reports Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Generate Reports: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_generate_reports_date():
-    console.clear()
+    console.rule()
     specific_date = "03-Νοεμβρίου-2025"  # Example date
     console.print("--- Generating Report for Specific Date ---")
     specific_date = Prompt.ask("[bold blue]Specify Date[/bold blue]")
     try:
+        from llm.generate_daily_reports import ReportGenerator
+
         args = argparse.Namespace(
             all=False,
             date=specific_date,
@@ -296,22 +359,33 @@ def run_generate_reports_date():
         generator = ReportGenerator(args)
         generator.run()
         console.print(f"--- Generate Report for {specific_date} Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Generate Reports: {e}\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def run_get_news_workflow():
-    console.clear()
+    console.rule()
     console.print("--- Starting Full 'Get News' Workflow ---")
     try:
-        scrape_news()
-        scrape_stats()
+        from scrapers.sports_news_scraper import scrape_news
+        from scrapers.stats_scraper import scrape_stats
+        from storage.db_store import get_db_store
+        from storage.vector_store import get_vector_store
+
+        # 1-2. News and stats come from different sites and share nothing, so
+        # scrape them side by side; result() re-raises any failure here.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scrapes = [executor.submit(scrape_news), executor.submit(scrape_stats)]
+            for scrape in scrapes:
+                scrape.result()
 
         # 3. Update VectorStore
         console.print("\n--- Updating VectorStore ---")
         try:
-            manager = VectorStoreManager()
+            manager = get_vector_store()
             manager.create_or_update(days_back=30)
             console.print("✅ VectorStore updated.")
         except Exception as e:
@@ -320,7 +394,7 @@ def run_get_news_workflow():
         # 4. Run DB Ingest (Assuming DBStore.run() handles ingestion)
         console.print("\n--- Running DB Ingest (via DBStore) ---")
         try:
-            store = DBStore()
+            store = get_db_store()
             store.run()
             console.print("✅ DB Ingest completed.")
         except Exception as e:
@@ -329,102 +403,101 @@ def run_get_news_workflow():
         console.print("\n" + "=" * 50)
         console.print("✅ Full 'Get News' Workflow completed.")
         console.print("=" * 50 + "\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"\n❌ Critical error in 'Get News' workflow: {e}\n")
     console.print("--- 'Get News' Workflow Completed ---\n")
-    input("Press Enter to continue...")
+    pause()
 
 
 def summarize_articles_workflow():
-    console.clear()
+    console.rule()
     console.print("--- Processing All Articles ---")
     try:
-        processor = ArticleProcessor(language=os.getenv("LANGUAGE", "greek"))
+        processor = get_article_processor(get_env("LANGUAGE", "greek"))
         processor.process_all_articles_in_parallel()
         console.print("--- Process All Articles Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Process Articles: {e}\n")
     console.print("--- Generating All Reports ---")
     try:
+        from llm.generate_daily_reports import ReportGenerator
+
         args = argparse.Namespace(
             all=True, date=None, sport=None, competition=None, method="summaries"
         )
         generator = ReportGenerator(args)
         generator.run()
         console.print("--- Generate All Reports Completed ---\n")
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"❌ Error in Generate Reports: {e}\n")
 
 
 def run_llm_chat():
+    console.rule()
     console.print("--- Starting LLM Chat ---")
     try:
+        from llm.llm_chat import llm_chat
+
         llm_chat()
+    except ImportError as e:
+        report_import_error(e)
     except Exception as e:
         console.print(f"\n❌ Critical error in Starting LLM Chat: {e}\n")
 
 
+def run_submenu(display_menu, actions: dict):
+    """Shows a submenu and runs the selected action. Unmapped choices (Back) return."""
+    action = actions.get(display_menu())
+    if action:
+        action()
+
+
+# --- Menu dispatch tables (choice -> action) ---
+VECTORSTORE_ACTIONS = {
+    1: run_vectorstore_create_update,
+    2: run_vectorstore_query,
+    3: run_vectorstore_clear,
+}
+
+PROCESS_ARTICLES_ACTIONS = {
+    1: run_process_specific_articles,
+    2: run_process_all_articles,
+}
+
+GENERATE_REPORTS_ACTIONS = {
+    1: run_generate_reports_all,
+    2: run_generate_reports_date,
+}
+
+INDIVIDUAL_MODULES_ACTIONS = {
+    1: run_dbstore,
+    2: lambda: run_submenu(display_vectorstore_menu, VECTORSTORE_ACTIONS),
+    3: run_stats_scraper,
+    4: run_news_scraper,
+    5: lambda: run_submenu(display_process_articles_menu, PROCESS_ARTICLES_ACTIONS),
+    6: lambda: run_submenu(display_generate_reports_menu, GENERATE_REPORTS_ACTIONS),
+}
+
+MAIN_ACTIONS = {
+    1: edit_config_file,
+    2: lambda: run_submenu(display_individual_modules_menu, INDIVIDUAL_MODULES_ACTIONS),
+    3: run_get_news_workflow,
+    4: summarize_articles_workflow,
+    5: run_llm_chat,
+}
+QUIT_CHOICE = 6
+
+
 def main():
-    while True:
-        choice = display_main_menu()
-        if choice == 1:  # Configuration
-            edit_config_file()  # This function handles the editing using the system editor
-        elif choice == 2:  # Individual Modules
-            ind_choice = display_individual_modules_menu()
-            if ind_choice == 1:  # DBStore
-                run_dbstore()
-            elif ind_choice == 2:  # VectorStore
-                vs_choice = display_vectorstore_menu()
-                if vs_choice == 1:  # Create/Update
-                    run_vectorstore_create_update()
-                elif vs_choice == 2:  # Query
-                    run_vectorstore_query()
-                elif vs_choice == 3:  # Clear
-                    run_vectorstore_clear()
-                elif choice == 4:  # Back
-                    continue
-                else:
-                    console.print("[red]Invalid choice. Please try again.[/red]")
-            elif ind_choice == 3:  # Stats Scraper
-                run_stats_scraper()
-            elif ind_choice == 4:  # News Scraper
-                run_news_scraper()
-            elif ind_choice == 5:  # Process Articles
-                pa_choice = display_process_articles_menu()
-                if pa_choice == 1:  # Process Specific
-                    run_process_specific_articles()
-                elif pa_choice == 2:  # Process All
-                    run_process_all_articles()
-                elif choice == 3:  # Back
-                    continue
-                else:
-                    console.print("[red]Invalid choice. Please try again.[/red]")
-            elif ind_choice == 6:  # Generate Reports
-                gr_choice = display_generate_reports_menu()
-                if gr_choice == 1:  # Generate All
-                    run_generate_reports_all()
-                elif gr_choice == 2:  # Generate Specific Date
-                    run_generate_reports_date()
-                elif choice == 3:  # Back
-                    continue
-                else:
-                    console.print("[red]Invalid choice. Please try again.[/red]")
-            elif ind_choice == 7:  # Back
-                continue
-            else:
-                console.print("[red]Invalid choice. Please try again.[/red]")
-        elif choice == 3:  # Get News And Stats
-            run_get_news_workflow()
-        elif choice == 4:  # Summarize Articles And Generate Daily Reports
-            summarize_articles_workflow()
-        elif choice == 5:  # Open Chat
-            console.clear()
-            run_llm_chat()
-        elif choice == 6:  # Quit
-            console.print("[bold red]Quitting...[/bold red]")
-            break
-        else:
-            console.print("[red]Invalid choice. Please try again.[/red]")
+    while (choice := display_main_menu()) != QUIT_CHOICE:
+        MAIN_ACTIONS[choice]()
+    console.print("[bold red]Quitting...[/bold red]")
 
 
 if __name__ == "__main__":
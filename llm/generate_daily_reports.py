@@ -1,16 +1,26 @@
 import argparse
-import json
+import functools
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import operator
 import os
-from collections import defaultdict
+import queue
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
+import orjson
 from dotenv import load_dotenv
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 
 from llm.llm_services import LANGUAGE, get_llm
-from storage.vector_store import VectorStoreManager
+from scrapers.utils import GREEK_MONTH_NOMINATIVE_MAP
 
 # --- Configuration ---
 load_dotenv()
@@ -21,6 +31,258 @@ REPORTS_BASE_DIR = Path(os.getenv("DAILY_REPORTS_DIR", "data/daily_reports"))
 REPORTS_BASE_DIR.mkdir(parents=True, exist_ok=True)
 
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", 4))
+# Remembers the group key of every raw article file by mtime, so unchanged files are not re-parsed.
+ARTICLE_INDEX_FILE = Path(
+    os.getenv("ARTICLE_INDEX_FILE", REPORTS_BASE_DIR / ".article_index.json")
+)
+
+# Article files at least this large are decoded straight from a memory map.
+MMAP_MIN_SIZE = int(os.getenv("MMAP_MIN_SIZE", 1024 * 1024))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+
+# Raw news folders use nominative month names, report folders the genitive form.
+NOMINATIVE_TO_GENITIVE_MONTH = {v: k for k, v in GREEK_MONTH_NOMINATIVE_MAP.items()}
+
+# <<< --- PROMPT 1: Daily Source Report --- >>>
+DAILY_REPORT_PROMPT = """
+    You are an elite sports journalist and editor. Your entire response MUST be in {language}.
+    Your task is to compile a daily digest for **{date}** from the news source **{source}**.
+    Your task is to read the following `Provided Context` and produce a final, verified, and comprehensive summary.
+    You must perform all steps internally—analysis, summarization, and fact-checking—before producing a single, perfect report Markdown output.
+
+
+    **Your Internal Thought Process (Don't write this in the output, just do it):**
+    1.  **Identify the main story**: Read through all the provided context. What is the single most important event or result?
+    2.  **Find supporting details**: What are the key statistics or performances that support the main story?
+    3.  **Draft a narrative**: Mentally structure the report with a strong opening headline, followed by the supporting details in a logical flow.
+    4.  **Self-Correction**: Is your draft a true synthesis, or just a list of the inputs? Ensure you are creating a cohesive narrative. Is everything 100% factually supported by the context? Did you miss anything important? Fix any mistakes and add any omissions.
+
+    **Final Report Structure**:
+    - **Top Headlines**: A paragraph summarizing the most significant results and news from this source.
+    - **Key Performances**: Bullet points highlighting standout player performances mentioned.
+    - **Preserve Names**: You MUST NOT translate proper nouns (player/team names). Keep them as they appear in the original article.
+
+    **Provided Context from {source}:**
+    ```{context}```
+    """
+
+# <<< --- PROMPT 2: Combined Competition Report --- >>>
+COMBINED_REPORT_PROMPT = """
+    You are a senior sports analyst, writing in {language}. Your task is to create a single, high-level summary for the **{competition}** competition on **{date}**.
+    You will be given context from multiple news sources. Your goal is to synthesize them into a single, cohesive narrative in **Markdown format**.
+
+    **Your Internal Thought Process (Perform these steps before writing):**
+    1.  **Identify the overarching theme**: After reading all context, what is the most important, agreed-upon story of the day for this competition? (e.g., a major upset, a dominant team performance).
+    2.  **Consolidate key facts**: Extract the most critical statistics and performances. If sources report the same fact, you only need to state it once. If they conflict, note the discrepancy if it's significant.
+    3.  **Structure the master narrative**: Plan the report. Start with the main theme, then provide the consolidated highlights as evidence.
+    4.  **Self-Correction**: Review your mental draft. Does it accurately reflect the consensus of the sources? Is it a true synthesis, or just a collection of separate points? Ensure the narrative flows logically.
+
+    **Final Report Structure**:
+    - **Overall Summary**: A main paragraph that combines the key events from all sources into a single narrative.
+    - **Consolidated Highlights**: A single, unified list of bullet points with the most impressive performances found across all sources.
+
+    **Provided Context from all sources:**
+    ```{context}```
+    """
+
+
+@dataclass(slots=True)
+class Article:
+    """The subset of a processed article JSON that the report prompts actually use."""
+
+    source: str
+    title: str | None
+    summary: str | None
+    highlights: list = field(default_factory=list)
+    content: str = ""
+
+
+def _drop_duplicates(articles, field_name: str):
+    """
+    Yields articles whose `field_name` text hasn't been seen yet, so wire copy republished
+    verbatim by several sources is only sent to the LLM once. Articles without that
+    text are compared by their content instead, and kept if they have none either.
+    """
+    seen = set()
+    for article in articles:
+        name, text = field_name, getattr(article, field_name)
+        if not text:
+            name, text = "content", article.content
+        if not text:
+            yield article
+            continue
+        key = (name, hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())
+        if key in seen:
+            continue
+        seen.add(key)
+        yield article
+
+
+def _walk_json_files(root: Path) -> dict:
+    """
+    Recursively lists the .json files under root as {path: mtime_ns}.
+    Uses os.scandir, whose entries carry cached file-type info, instead of Path.rglob.
+    """
+    json_files = {}
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".json"):
+                        json_files[entry.path] = entry.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return json_files
+
+
+def _scan_roots(sport, comp, date) -> list[Path]:
+    """
+    Returns the raw news subtrees that can hold articles matching the filters, using the
+    sport/competition/year/month/day/source layout, so the walk skips everything else.
+    """
+    levels = [sport, comp]
+    if date:
+        try:
+            day, month, year = date.split("-")
+            levels += [year, GREEK_MONTH_NOMINATIVE_MAP[month], day]
+        except (ValueError, KeyError):
+            pass  # Unrecognized date format: filter after parsing instead.
+    # Unfiltered trailing levels are covered by the walk itself.
+    while levels and not levels[-1]:
+        levels.pop()
+
+    roots = [RAW_NEWS_DATA_DIR]
+    for level in levels:
+        if level:
+            roots = [root / level for root in roots]
+            continue
+        # Unfiltered level in between (e.g. --date without --sport): expand its folders.
+        expanded = []
+        for root in roots:
+            try:
+                with os.scandir(root) as entries:
+                    expanded += [Path(e.path) for e in entries if e.is_dir()]
+            except FileNotFoundError:
+                continue
+        roots = expanded
+    return roots
+
+
+def _read_json(path: str):
+    """
+    Decodes a JSON file with orjson. Large files are parsed zero-copy from a memory map
+    instead of being read into a bytes object first.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _key_matches(key, filters: tuple) -> bool:
+    """Checks a (sport, competition, date) key against (sport, competition, date) filters; None matches all."""
+    return all(not wanted or wanted == value for wanted, value in zip(filters, key))
+
+
+def _parse_article(article_file: str, filters: tuple = (None, None, None)):
+    """
+    Reads and decodes a single article file in a worker process.
+    Returns ((sport, competition, date), Article) for processed articles that match the
+    filters, (key, None) for those that don't, (None, None) for articles that can't be
+    reported yet, and None if the file could not be read.
+    """
+    try:
+        data = _read_json(article_file)
+        if data.get("processing_status") != "processed":
+            return None, None
+
+        sport = data.get("sport")
+        comp = data.get("competition")
+        article = data.get("article", {})
+        date_folder = article.get("date_published", "").replace(" ", "-")
+
+        # Articles without a full (sport, comp, date) key have no report folder.
+        if not (sport and comp and date_folder):
+            return None, None
+
+        key = (sport, comp, date_folder)
+        # Filtered-out articles only report their key (for the index), not their content.
+        if not _key_matches(key, filters):
+            return key, None
+
+        # Keep only the fields the prompts need, not the whole scraped JSON.
+        return (
+            key,
+            Article(
+                source=data.get("source") or "Unknown",
+                title=article.get("title"),
+                summary=data.get("summary"),
+                highlights=data.get("highlights", []),
+                content=article.get("content", ""),
+            ),
+        )
+    except Exception as e:
+        print(f"⚠️ Could not process file {os.path.basename(article_file)}: {e}")
+        return None
+
+
+def _report_key_from_path(article_file: str):
+    """
+    Derives the (sport, competition, date, source) report an article belongs to from the
+    raw news layout (sport/competition/year/month/day/source/article.json) without
+    reading the file. Returns None if the path does not follow that layout.
+    """
+    try:
+        rel_parts = os.path.relpath(article_file, RAW_NEWS_DATA_DIR).split(os.sep)
+        sport, comp, year, month, day, source = rel_parts[:6]
+    except ValueError:
+        return None
+    month = NOMINATIVE_TO_GENITIVE_MONTH.get(month)
+    if month is None:
+        return None
+    return sport, comp, f"{day}-{month}-{year}", source
+
+
+def _load_article_index() -> dict:
+    """Loads the {path: [mtime_ns, group key or None]} index of previously parsed articles."""
+    try:
+        return orjson.loads(ARTICLE_INDEX_FILE.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+
+def _save_article_index(index: dict):
+    """Writes the article index atomically, so an interrupted run can't corrupt it."""
+    tmp_file = ARTICLE_INDEX_FILE.with_suffix(".tmp")
+    tmp_file.write_bytes(orjson.dumps(index))
+    tmp_file.replace(ARTICLE_INDEX_FILE)
+
+
+def _existing_reports() -> tuple[set, set]:
+    """
+    Returns the (sport, competition, date) groups whose combined report exists, and the
+    (sport, competition, date, source) keys whose daily source report exists.
+    """
+    combined = {
+        (report.parent.parent.parent.name, report.parent.parent.name, report.parent.name)
+        for report in REPORTS_BASE_DIR.glob("*/*/*/daily_summary_report.md")
+    }
+    daily = {
+        (
+            report.parent.parent.parent.name,
+            report.parent.parent.name,
+            report.parent.name,
+            report.stem.removeprefix("daily_report_"),
+        )
+        for report in REPORTS_BASE_DIR.glob("*/*/*/daily_report_*.md")
+    }
+    return combined, daily
+
 
 class ReportGenerator:
     """
@@ -30,220 +292,284 @@ class ReportGenerator:
     def __init__(self, args):
         self.args = args
         print(f"ℹ️  Initializing ReportGenerator with task arguments...")
-        self.vs_manager = VectorStoreManager()
+        # Resolve the (sport, competition, date) filters once; date is normalized for matching.
+        self._sport_filter = args.sport
+        self._comp_filter = args.competition
+        self._date_filter = args.date.replace(" ", "-") if args.date else None
+        self.llm = get_llm()
+        # Compile each prompt template and chain once, not per report.
+        self.report_chains = {
+            "daily": self._build_chain(DAILY_REPORT_PROMPT),
+            "combined": self._build_chain(COMBINED_REPORT_PROMPT),
+        }
+        # run() starts a background writer that flushes reports to disk while the LLM
+        # keeps working.
+        self._write_q = None
+        self._created_dirs = set()  # Only touched by the writer thread.
+        # Loaded before any of our threads start, since parsing forks worker processes.
         self.workload = self._load_and_filter_articles()
         print(f"✅ ReportGenerator ready with {MAX_WORKERS} workers.")
 
     def _load_and_filter_articles(self) -> dict:
         """
         Loads all processed articles and filters them based on command-line arguments.
-        Returns a dictionary grouped by (sport, competition, date) for the specified workload.
+        Returns a dictionary grouped by (sport, competition, date), then by source, for the
+        specified workload.
         """
         print("🔎 Loading and filtering articles...")
-        grouped_articles = defaultdict(list)
-        all_files = list(RAW_NEWS_DATA_DIR.rglob("*.json"))
-        for article_file in all_files:
-            try:
-                with open(article_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                if data.get("processing_status") != "processed":
-                    continue
-
-                # --- Filtering Logic ---
-                sport = data.get("sport")
-                comp = data.get("competition")
-                # Normalize date format for reliable matching
-                date_folder = (
-                    data.get("article", {}).get("date_published", "").replace(" ", "-")
+        # Only walk the folders the filters can match.
+        scan_roots = _scan_roots(
+            self._sport_filter, self._comp_filter, self._date_filter
+        )
+        all_files = {}
+        for scan_root in scan_roots:
+            all_files.update(_walk_json_files(scan_root))
+        full_scan = scan_roots == [RAW_NEWS_DATA_DIR]
+
+        # Keep the index entries of files that haven't changed since they were parsed.
+        # A partial scan also keeps the entries of files outside the scanned folders.
+        cached_index = _load_article_index()
+        article_index = {
+            path: entry
+            for path, entry in cached_index.items()
+            if (mtime := all_files.get(path)) == entry[0]
+            or (mtime is None and not full_scan)
+        }
+
+        # Smart Skip Logic: with --all, don't even read an article whose daily source
+        # report and combined group report both exist already.
+        candidate_files = all_files.keys()
+        if self.args.all:
+            combined_done, daily_done = _existing_reports()
+            candidate_files = [
+                f
+                for f in candidate_files
+                if not (
+                    (key := _report_key_from_path(f))
+                    and key[:3] in combined_done
+                    and key in daily_done
                 )
+            ]
+
+        # --- Filtering Logic ---
+        filters = (self._sport_filter, self._comp_filter, self._date_filter)
+
+        # Unchanged files whose indexed group is unreportable or filtered out are not opened.
+        files_to_parse = [
+            f
+            for f in candidate_files
+            if f not in article_index
+            or (
+                article_index[f][1] is not None
+                and _key_matches(article_index[f][1], filters)
+            )
+        ]
 
-                if self.args.sport and sport != self.args.sport:
-                    continue
-                if self.args.competition and comp != self.args.competition:
-                    continue
-                if self.args.date and date_folder != self.args.date.replace(" ", "-"):
-                    continue
-
-                # Pass the article file path along for robust file fetching in parallel
-                data["file_path"] = str(article_file) 
-                grouped_articles[(sport, comp, date_folder)].append(data)
-            except Exception as e:
-                print(f"⚠️ Could not process file {article_file.name}: {e}")
+        # Reading, decoding and filtering is spread over worker processes, which return
+        # the slim (key, Article) pairs and skip building an Article for rejected files.
+        keyed_articles = []
+        if files_to_parse:
+            parse = functools.partial(_parse_article, filters=filters)
+            # Forking while other threads run can deadlock the children on locks those
+            # threads hold, so a multi-threaded caller (e.g. the CLI after a chat
+            # session) gets freshly spawned workers instead.
+            mp_context = (
+                multiprocessing.get_context("spawn")
+                if threading.active_count() > 1
+                else None
+            )
+            with ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=mp_context
+            ) as executor:
+                parsed = executor.map(parse, files_to_parse, chunksize=64)
+                for article_file, item in zip(files_to_parse, parsed):
+                    if item is None:
+                        continue  # Unreadable files are retried on the next run.
+                    key, article = item
+                    article_index[article_file] = [all_files[article_file], key]
+                    if article is not None:
+                        keyed_articles.append(item)
+        _save_article_index(article_index)
+
+        # Sort once by (group key, source) and group contiguous runs into
+        # {(sport, comp, date): {source: [Article, ...]}}; this also gives a
+        # deterministic report order.
+        keyed_articles.sort(key=lambda item: (item[0], item[1].source))
+        by_source = operator.attrgetter("source")
+        grouped_articles = {
+            key: {
+                source: list(source_articles)
+                for source, source_articles in itertools.groupby(
+                    (article for _, article in group), key=by_source
+                )
+            }
+            for key, group in itertools.groupby(
+                keyed_articles, key=operator.itemgetter(0)
+            )
+        }
 
         print(
             f"✅ Found {len(grouped_articles)} unique competition-dates matching filter criteria."
         )
         return grouped_articles
 
-    def _generate_markdown_report(self, llm_client, prompt_template: str, context: dict) -> str:
-        """Helper function to invoke the LLM chain and return a markdown report."""
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | llm_client | StrOutputParser()
-        try:
-            context["language"] = LANGUAGE
-            return chain.invoke(context)
-        except Exception as e:
-            print(f" ❌ LLM Error: {e}")
-            return f"# LLM Generation Error\n\nAn error occurred: {e}"
-
-    def _get_content_from_summaries(self, articles: list) -> str:
-        """Prepares a JSON string of summaries for the prompt context."""
-        summaries_list = [
-            {
-                "source": article.get("source"),
-                "title": article.get("article", {}).get("title"),
-                "summary": article.get("summary"),
-                "highlights": article.get("highlights", []),
-            }
-            for article in articles
-        ]
-        return json.dumps(summaries_list, indent=2, ensure_ascii=False)
-
-    def _get_content_from_vectorstore(self, articles: list) -> str:
-        """Fetches and concatenates full article content for the prompt context."""
-        print("  - Fetching full content from source files...")
-        full_contents = []
-        for article_data in articles:
-            # We now rely on 'file_path' being added during the _load_and_filter_articles step
-            file_path = article_data.get("file_path")
-            if file_path:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        raw_data = json.load(f)
-                    full_contents.append(
-                        raw_data.get("article", {}).get("content", "")
-                    )
-                except FileNotFoundError:
-                    full_contents.append(
-                        article_data.get("article", {}).get("content", "")
-                    ) # Fallback
-            else:
-                full_contents.append(article_data.get("article", {}).get("content", ""))
-        return "\n\n--- ARTICLE SEPARATOR ---\n\n".join(filter(None, full_contents))
-
-    def _process_report_group(self, group_key_and_articles: tuple):
-        """Worker function that processes all reports for a single (sport, comp, date) group."""
-        (sport, comp, date), articles = group_key_and_articles
-        
-        # Initialize LLM client for this thread/worker.
-        llm_client = get_llm()
-        
-        # Define output directory for this specific group
+    def _writer_loop(self):
+        """Consumes (path, text) items from the write queue until a None sentinel arrives."""
+        while (item := self._write_q.get()) is not None:
+            report_path, report_content = item
+            try:
+                # Create each report folder once, and only when something is written to it.
+                if report_path.parent not in self._created_dirs:
+                    report_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._created_dirs.add(report_path.parent)
+                # Write bytes directly: no text-mode codec or newline translation.
+                report_path.write_bytes(report_content.encode("utf-8"))
+                print(f"  ✅ Saved report: {report_path}")
+            except OSError as e:
+                print(f"  ❌ Could not write report {report_path}: {e}")
+
+    def _build_chain(self, prompt_template: str):
+        """Compiles a report prompt template into a prompt | llm | parser chain."""
+        prompt = ChatPromptTemplate.from_template(
+            prompt_template, partial_variables={"language": LANGUAGE}
+        )
+        return prompt | self.llm | StrOutputParser()
+
+    def _generate_markdown_reports(self, jobs: list):
+        """
+        Invokes each job's report chain, all jobs in one concurrent batch, so at most
+        MAX_WORKERS requests are in flight whatever the mix of report types.
+        Yields (index, markdown report) pairs as soon as each report is ready.
+        """
+        generate = RunnableLambda(
+            lambda job: self.report_chains[job[0]].invoke(job[1])
+        )
+        for index, result in generate.batch_as_completed(
+            [(report_type, context) for _, report_type, context in jobs],
+            config={"max_concurrency": MAX_WORKERS},
+            return_exceptions=True,
+        ):
+            if isinstance(result, Exception):
+                print(f" ❌ LLM Error: {result}")
+                result = f"# LLM Generation Error\n\nAn error occurred: {result}"
+            yield index, result
+
+    def _get_content_from_summaries(self, articles) -> str:
+        """
+        Renders the summaries as a compact plain-text block for the prompt context.
+        Plain text skips JSON quoting and indentation, which only cost prompt tokens.
+        """
+        return "\n\n".join(
+            f"[{article.source}] {article.title or ''}\n"
+            f"{article.summary or ''}\n"
+            f"Highlights: {'; '.join(article.highlights or [])}"
+            for article in _drop_duplicates(articles, "summary")
+        )
+
+    def _get_content_from_vectorstore(self, articles) -> str:
+        """Concatenates the full article content (already loaded from the source files) for the prompt context."""
+        return "\n\n--- ARTICLE SEPARATOR ---\n\n".join(
+            article.content
+            for article in _drop_duplicates(articles, "content")
+            if article.content
+        )
+
+    def _collect_report_jobs(self, group_key: tuple, articles_by_source: dict) -> list:
+        """Builds the (report_path, report_type, context) jobs for a single (sport, comp, date) group."""
+        sport, comp, date = group_key
+        jobs = []
+
+        # Define output directory for this specific group (created by the writer on demand)
         output_dir = REPORTS_BASE_DIR / sport / comp / date
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # --- 1. Generate Daily Report for Each Source (still sequential inside the worker) ---
-        articles_by_source = defaultdict(list)
-        for article in articles:
-            articles_by_source[article.get("source", "Unknown")].append(article)
 
+        # --- 1. Daily Report for Each Source ---
         for source, source_articles in articles_by_source.items():
             report_path = output_dir / f"daily_report_{source}.md"
             # Smart Skip Logic: Skip if using --all and file exists.
             if self.args.all and report_path.exists():
-                print(f"⏭️ Worker for {date} skipping existing daily report: {report_path.name}")
+                print(f"⏭️ Skipping existing daily report for {date}: {report_path.name}")
                 continue
 
-            print(f"📅 Worker for {date} generating daily report for {source}...")
             content_for_llm = (
                 self._get_content_from_summaries(source_articles)
                 if self.args.method == "summaries"
                 else self._get_content_from_vectorstore(source_articles)
             )
-
-            # <<< --- PROMPT 1: Daily Source Report --- >>>
-            prompt_template = """
-                You are an elite sports journalist and editor. Your entire response MUST be in {language}.
-                Your task is to compile a daily digest for **{date}** from the news source **{source}**.
-                Your task is to read the following `Provided Context` and produce a final, verified, and comprehensive summary.
-                You must perform all steps internally—analysis, summarization, and fact-checking—before producing a single, perfect report Markdown output.
-                
-
-                **Your Internal Thought Process (Don't write this in the output, just do it):**
-                1.  **Identify the main story**: Read through all the provided context. What is the single most important event or result?
-                2.  **Find supporting details**: What are the key statistics or performances that support the main story?
-                3.  **Draft a narrative**: Mentally structure the report with a strong opening headline, followed by the supporting details in a logical flow.
-                4.  **Self-Correction**: Is your draft a true synthesis, or just a list of the inputs? Ensure you are creating a cohesive narrative. Is everything 100% factually supported by the context? Did you miss anything important? Fix any mistakes and add any omissions.
-
-                **Final Report Structure**:
-                - **Top Headlines**: A paragraph summarizing the most significant results and news from this source.
-                - **Key Performances**: Bullet points highlighting standout player performances mentioned.
-                - **Preserve Names**: You MUST NOT translate proper nouns (player/team names). Keep them as they appear in the original article.
-                
-                **Provided Context from {source}:**
-                ```{context}```
-                """
-            report_content = self._generate_markdown_report(
-                llm_client,
-                prompt_template,
-                {"date": date, "source": source, "context": content_for_llm},
+            jobs.append(
+                (
+                    report_path,
+                    "daily",
+                    {"date": date, "source": source, "context": content_for_llm},
+                )
             )
-            with open(report_path, "w", encoding="utf-8") as f:
-                f.write(report_content)
-            print(f"  ✅ Worker for {date} saved daily report: {report_path.name}")
 
-        # --- 2. Generate Combined Report for the Date ---
+        # --- 2. Combined Report for the Date ---
         combined_report_path = output_dir / "daily_summary_report.md"
         if self.args.all and combined_report_path.exists():
             print(
-                f"⏭️ Worker for {date} skipping existing combined report: {combined_report_path.name}"
+                f"⏭️ Skipping existing combined report for {date}: {combined_report_path.name}"
             )
-            return
+            return jobs
 
-        print(f"📈 Worker for {date} generating combined summary for {comp}...")
+        # The combined report reads every source's articles in one lazy pass.
+        articles = itertools.chain.from_iterable(articles_by_source.values())
         content_for_llm = (
             self._get_content_from_summaries(articles)
             if self.args.method == "summaries"
             else self._get_content_from_vectorstore(articles)
         )
-
-        # <<< --- PROMPT 2: Combined Competition Report --- >>>
-        prompt_template = """
-            You are a senior sports analyst, writing in {language}. Your task is to create a single, high-level summary for the **{competition}** competition on **{date}**.
-            You will be given context from multiple news sources. Your goal is to synthesize them into a single, cohesive narrative in **Markdown format**.
-
-            **Your Internal Thought Process (Perform these steps before writing):**
-            1.  **Identify the overarching theme**: After reading all context, what is the most important, agreed-upon story of the day for this competition? (e.g., a major upset, a dominant team performance).
-            2.  **Consolidate key facts**: Extract the most critical statistics and performances. If sources report the same fact, you only need to state it once. If they conflict, note the discrepancy if it's significant.
-            3.  **Structure the master narrative**: Plan the report. Start with the main theme, then provide the consolidated highlights as evidence.
-            4.  **Self-Correction**: Review your mental draft. Does it accurately reflect the consensus of the sources? Is it a true synthesis, or just a collection of separate points? Ensure the narrative flows logically.
-
-            **Final Report Structure**:
-            - **Overall Summary**: A main paragraph that combines the key events from all sources into a single narrative.
-            - **Consolidated Highlights**: A single, unified list of bullet points with the most impressive performances found across all sources.
-
-            **Provided Context from all sources:**
-            ```{context}```
-            """
-        report_content = self._generate_markdown_report(
-            llm_client,
-            prompt_template,
-            {"date": date, "competition": comp, "context": content_for_llm},
+        jobs.append(
+            (
+                combined_report_path,
+                "combined",
+                {"date": date, "competition": comp, "context": content_for_llm},
+            )
         )
-        with open(combined_report_path, "w", encoding="utf-8") as f:
-            f.write(report_content)
-        print(f"  ✅ Worker for {date} saved combined report: {combined_report_path.name}")
+        return jobs
 
     def run(self):
         """
-        Main execution loop that generates reports based on the loaded workload, now in parallel.
+        Main execution loop. Collects every pending report first, then sends all prompts
+        to the LLM as one concurrent batch.
         """
         if not self.workload:
             print("ℹ️ No articles match the specified criteria. Nothing to do.")
             return
 
-        print(f"\n--- Starting Parallel Report Generation with {MAX_WORKERS} workers ---")
-        
-        # Convert workload dict_items to a list of tuples for map function
-        workload_list = list(self.workload.items()) 
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # executor.map will distribute the workload_list items (the groups)
-            # to the _process_report_group worker function.
-            executor.map(self._process_report_group, workload_list)
-
-        print(f"\n✅ All parallel generation tasks complete.")
+        # --- Pass 1: Collect all pending report jobs ---
+        jobs = [
+            job
+            for group_key, articles_by_source in self.workload.items()
+            for job in self._collect_report_jobs(group_key, articles_by_source)
+        ]
+
+        if not jobs:
+            print("ℹ️ All matching reports already exist. Nothing to do.")
+            return
+
+        # The writer only starts once there is work, and is always stopped and joined,
+        # so queued reports are flushed even if a batch fails.
+        self._write_q = queue.Queue()
+        writer = threading.Thread(target=self._writer_loop, daemon=True)
+        writer.start()
+        try:
+            # --- Pass 2: One batched LLM call for every report ---
+            # Daily and combined reports are built from the same articles and never
+            # read each other, so they share one batch and its MAX_WORKERS budget.
+            print(
+                f"\n--- Starting Batched Report Generation with {MAX_WORKERS} workers ---"
+            )
+            for report_type, count in Counter(job[1] for job in jobs).items():
+                print(f"📅 Generating {count} {report_type} reports...")
+            # Hand each report to the writer as soon as it arrives, while the rest of
+            # the batch is still being generated.
+            for index, report_content in self._generate_markdown_reports(jobs):
+                self._write_q.put((jobs[index][0], report_content))
+        finally:
+            # Wait for the writer to flush every queued report before returning.
+            self._write_q.put(None)
+            writer.join()
+        print(f"\n✅ All batched generation tasks complete.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
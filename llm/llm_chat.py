@@ -1,48 +1,96 @@
-from datetime import datetime
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import date
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List
 
 from dotenv import load_dotenv
 from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, dynamic_prompt
+from langchain_core.messages import ToolMessage
 from langchain_core.tools import tool
 from langgraph.checkpoint.memory import InMemorySaver
-from rich.console import Console
+from langgraph.config import get_config
+from rich.console import Console, Group
 from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.rule import Rule
+from rich.text import Text
 
 from llm.llm_services import LANGUAGE, get_llm
 from llm.process_queries import (
     translate_name as helper_translate_name,
     improve_vector_query as helper_improve_query,
 )
-from storage.db_store import DBStore
-from storage.vector_store import VectorStoreManager
+from storage.db_store import STATS_CACHE_TTL, get_db_store
+from storage.vector_store import get_vector_store
 
 load_dotenv()
 
 console = Console()
-vs_manager = VectorStoreManager()
-db_store = DBStore()
+# Minimum seconds between Markdown re-renders of a streaming answer.
+RENDER_INTERVAL = 1 / 12
+SNIPPET_CHARS = 400
+MAX_AMBIGUOUS_PLAYERS = int(os.getenv("MAX_AMBIGUOUS_PLAYERS", 20))
+EXIT_COMMANDS = frozenset({"quit", "exit", "q"})
+# Flattens line breaks and tabs in article snippets in a single pass.
+_WS_TABLE = str.maketrans("\n\r\t", "   ")
+_LATIN_NAME_RE = re.compile(r"[A-Za-z][A-Za-z'\-.\s]{0,40}")
+_agent_lock = threading.Lock()
+# Entity names (casefolded) mapped to the spelling that resolved in the database, and
+# translations awaiting a successful lookup (translated key -> original key).
+_NAME_ALIASES: dict[str, str] = {}
+_TRANSLATED_FROM: dict[str, str] = {}
 
 
 # ==================================================
 # TOOL 1: Search Knowledge Base (Articles)
 # ==================================================
+def _format_snippets(results) -> str:
+    if not results:
+        return "No relevant articles found in the knowledge base."
+    parts = []
+    for r in results:
+        title = r["metadata"].get("title", "Untitled")
+        content = r["content"][:SNIPPET_CHARS].translate(_WS_TABLE)
+        parts.append(f"📄 **{title}**: {content}...")
+    return "\n\n".join(parts)
+
+
 @tool
 def search_knowledge_base(query: str) -> str:
     """Search internal sports news articles for insights, commentary, or context."""
     try:
-        results = vs_manager.query(query, k=3)
-        if not results:
-            return "No relevant articles found in the knowledge base."
-        parts = []
-        for r in results:
-            title = r["metadata"].get("title", "Untitled")
-            content = r["content"][:400].replace("\n", " ")
-            parts.append(f"📄 **{title}**: {content}...")
-        return "\n\n".join(parts)
+        # Repeated questions differ mostly in case and spacing, so normalizing them lets
+        # the vector store's query cache (cleared whenever the index changes) hit.
+        normalized = " ".join(query.lower().split())
+        return _format_snippets(get_vector_store().query(normalized, k=3))
+    except Exception as e:
+        return f"Error searching knowledge base: {str(e)}"
+
+
+@tool
+def search_knowledge_base_batch(queries: List[str]) -> str:
+    """
+    Search internal sports news articles for several queries in one call (e.g., one per
+    team or player). Prefer this over repeated search_knowledge_base calls.
+    """
+    try:
+        # Normalize like the single-query tool and drop repeats before embedding.
+        normalized = list(dict.fromkeys(" ".join(q.lower().split()) for q in queries))
+        batch_results = get_vector_store().query_batch(normalized, k=3)
+        return "\n\n".join(
+            f"### {query}\n{_format_snippets(results)}"
+            for query, results in zip(normalized, batch_results)
+        )
     except Exception as e:
         return f"Error searching knowledge base: {str(e)}"
 
@@ -50,6 +98,51 @@ def search_knowledge_base(query: str) -> str:
 # ==================================================
 # TOOL 2: Query Player/Team Stats from DB
 # ==================================================
+@lru_cache(maxsize=512)
+def _cached_db_stats(
+    cache_epoch: tuple, entity_name: str, scope: str, metric: str, limit: int
+) -> str:
+    """
+    Runs a stats lookup once per distinct normalized argument set; errors are not cached.
+    `cache_epoch` is only part of the key: it changes after an ingest and every
+    STATS_CACHE_TTL seconds, so stale entries stop being hit. Misses go through the
+    shared Redis cache when one is configured.
+    """
+    return get_db_store().cached(
+        f"{scope}:{metric}:{limit}:{entity_name}",
+        lambda: _query_db_stats(entity_name, scope, metric, limit),
+    )
+
+
+def _query_db_stats(entity_name: str, scope: str, metric: str, limit: int) -> str:
+    # 1. Handle Team Match History
+    if scope == "team_matches":
+        return get_db_store().get_team_last_matches(entity_name, limit)
+
+    # 2. Handle Player Recent Performance (Last X Games)
+    elif scope == "player_recent":
+        return get_db_store().get_player_last_games(entity_name, limit)
+    # 3. Handle Player Averages (Default)
+    elif scope == "averages":
+        return get_db_store().get_player_averages(entity_name, metric)
+    # 4. Handle the Full Player Profile (averages + recent games + team form)
+    elif scope == "full_profile":
+        return get_db_store().get_player_profile(entity_name, limit)
+
+    return f"Invalid scope '{scope}'. Must be 'averages', 'team_matches', 'player_recent', or 'full_profile'."
+
+
+def _alias_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def clear_caches():
+    """Drops cached tool results so a new chat session sees fresh articles and stats."""
+    _cached_db_stats.cache_clear()
+    _NAME_ALIASES.clear()
+    _TRANSLATED_FROM.clear()
+
+
 @tool
 def query_database_stats(
     entity_name: str, scope: str = "averages", metric: str = "all", limit: int = 5
@@ -63,23 +156,49 @@ def query_database_stats(
             - 'averages' (default): Get a player's season averages (e.g., points/game).
             - 'team_matches': Get the team's last match results (score-wise).
             - 'player_recent': Get a player's individual performance stats for their last X games.
+            - 'full_profile': Get a player's averages, their last X games and their team's last X matches in one call.
+              Prefer this for general questions like "how is player X doing?".
         metric (str): Used only with scope='averages'. The specific stat to look up (e.g., 'Points', 'Goals', 'all').
-        limit (int): Used with scope='team_matches' or 'player_recent'. The number of recent games (X) to look up. Defaults to 5.
+        limit (int): Used with scope='team_matches', 'player_recent' or 'full_profile'. The number of recent games (X) to look up. Defaults to 5.
     """
     try:
-        # 1. Handle Team Match History
-        if scope == "team_matches":
-            return db_store.get_team_last_matches(entity_name, limit)
+        # Names keep their case: SQLite's LIKE only folds ASCII, so Greek names must stay as typed.
+        key = _alias_key(entity_name)
+        entity_name = _NAME_ALIASES.get(key, " ".join(entity_name.split()))
+        args = (entity_name, scope.strip(), metric.casefold(), limit)
+        if STATS_CACHE_TTL > 0:
+            cache_epoch = (
+                get_db_store().data_version,
+                int(time.monotonic() // STATS_CACHE_TTL),
+            )
+            result = _cached_db_stats(cache_epoch, *args)
+        else:
+            result = _query_db_stats(*args)  # STATS_CACHE_TTL <= 0 turns caching off
+        # A translated name that resolves becomes the alias of the original one, so the
+        # next question about it skips the failed lookup and the translate round-trip.
+        original = _TRANSLATED_FROM.pop(key, None)
+        if original and not result.startswith("Could not find"):
+            _NAME_ALIASES[original] = entity_name
+        return result
+    except Exception as e:
+        return f"An error occurred while querying the database: {type(e).__name__}"
 
-        # 2. Handle Player Recent Performance (Last X Games)
-        elif scope == "player_recent":
-            return db_store.get_player_last_games(entity_name, limit)
-        # 3. Handle Player Averages (Default)
-        elif scope == "averages":
-            return db_store.get_player_averages(entity_name, metric)
 
-        return f"Invalid scope '{scope}'. Must be 'averages', 'team_matches', or 'player_recent'."
+@tool
+def query_database_stats_bulk(player_names: List[str], metric: str = "all") -> str:
+    """
+    Use this tool instead of several query_database_stats calls when you need season
+    averages for two or more players (e.g., comparing players).
 
+    Args:
+        player_names (List[str]): The full names of the players, as in query_database_stats.
+        metric (str): The specific stat to look up (e.g., 'Points', 'Goals', 'all').
+    """
+    try:
+        return get_db_store().get_players_averages(
+            [_NAME_ALIASES.get(_alias_key(name), name) for name in player_names],
+            metric,
+        )
     except Exception as e:
         return f"An error occurred while querying the database: {type(e).__name__}"
 
@@ -94,21 +213,32 @@ def find_ambiguous_players(surname: str) -> str:
     to get a list of matching players, their teams, and sports.
     The output helps you ask a clarifying question to the user in the format: "Player Name (Team Name)".
     """
-    results: List[Dict[str, str]] = db_store.get_players_by_surname(surname)
+    # One row past the cap tells whether the list was cut short.
+    results: List[Dict[str, str]] = get_db_store().get_players_by_surname(
+        surname, limit=MAX_AMBIGUOUS_PLAYERS + 1
+    )
 
     if not results:
         return f"No players found with the surname '{surname}' in the database."
 
-    # Format the results for the LLM's consumption/response generation
-    formatted_results = [
-        f"Found the following {len(results)} players matching '{surname}':"
-    ]
-    for i, p in enumerate(results):
-        formatted_results.append(
-            f"{i+1}. **{p['full_name']}** (Team: {p['team']}, Sport: {p['sport']})"
+    # Format the results for the LLM's consumption/response generation. Common surnames
+    # are capped so the list doesn't flood the context window.
+    if len(results) > MAX_AMBIGUOUS_PLAYERS:
+        header = (
+            f"Found more than {MAX_AMBIGUOUS_PLAYERS} players matching '{surname}' "
+            f"(showing the first {MAX_AMBIGUOUS_PLAYERS}):"
         )
-
-    return "\n".join(formatted_results)
+    else:
+        header = f"Found the following {len(results)} players matching '{surname}':"
+    return "\n".join(
+        [
+            header,
+            *(
+                f"{i}. **{p['full_name']}** (Team: {p['team']}, Sport: {p['sport']})"
+                for i, p in enumerate(islice(results, MAX_AMBIGUOUS_PLAYERS), 1)
+            ),
+        ]
+    )
 
 
 # ==================================================
@@ -121,6 +251,20 @@ def translate_name(text: str, target_lang: str) -> str:
     (obtained from the LANGUAGE environment variable, e.g., 'Greek') when an initial
     database query fails, allowing a retry with the translated name.
     """
+    key = _alias_key(text)
+    # Names that already resolved, and Latin-script names when the target language is
+    # English, need no LLM round-trip.
+    if key in _NAME_ALIASES:
+        return _NAME_ALIASES[key]
+    if LANGUAGE.casefold() == "english" and _LATIN_NAME_RE.fullmatch(text.strip()):
+        return text.strip()
+    translated = _cached_translation(" ".join(text.split()))
+    _TRANSLATED_FROM[_alias_key(translated)] = key
+    return translated
+
+
+@lru_cache(maxsize=256)
+def _cached_translation(text: str) -> str:
     # Calls the actual LLM-powered helper function
     return helper_translate_name(text)
 
@@ -156,7 +300,7 @@ def get_team_key_players(team_name: str, limit: int = 5) -> str:
         A formatted list of top players with their key stats.
     """
     try:
-        return db_store.get_team_key_players(team_name, limit)
+        return get_db_store().get_team_key_players(team_name, limit)
     except Exception as e:
         return f"Error retrieving key players for {team_name}: {str(e)}"
 
@@ -178,7 +322,7 @@ def get_head_to_head_player_stats(team1_name: str, team2_name: str) -> str:
         A comparison of top scorers/rated players from each team with their stats.
     """
     try:
-        return db_store.get_head_to_head_player_stats(team1_name, team2_name)
+        return get_db_store().get_head_to_head_player_stats(team1_name, team2_name)
     except Exception as e:
         return f"Error comparing players between {team1_name} and {team2_name}: {str(e)}"
 
@@ -200,21 +344,84 @@ def get_upcoming_matches(team1_name: str, team2_name: str) -> str:
         A list of recent matches between the two teams with dates and scores.
     """
     try:
-        return db_store.get_upcoming_matches(team1_name, team2_name)
+        return get_db_store().get_upcoming_matches(team1_name, team2_name)
     except Exception as e:
         return f"Error retrieving matches between {team1_name} and {team2_name}: {str(e)}"
 
 
-def setup_agent():
-    model = get_llm()
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    language = LANGUAGE
-    prompt = f"""
+# ==================================================
+# Agent Middleware
+# ==================================================
+class ToolMemo(AgentMiddleware):
+    """
+    Answers a repeated tool call (same tool, same arguments) from memory within one
+    agent turn, so the agent re-asking the same question costs no DB or vector query.
+    Identical calls made in parallel from one model message wait for the first one.
+    Results are kept per chat thread and dropped when a turn starts and ends.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._results: Dict[str, Dict[tuple, Future]] = {}
+        self._lock = threading.Lock()
+
+    def wrap_tool_call(self, request, handler):
+        call = request.tool_call
+        thread_id = request.runtime.config["configurable"].get("thread_id")
+        args_hash = hashlib.blake2b(
+            repr(sorted(call["args"].items())).encode(), digest_size=16
+        ).hexdigest()
+        key = (call["name"], args_hash)
+        with self._lock:
+            memo = self._results.setdefault(thread_id, {})
+            pending = memo.get(key)
+            if pending is None:
+                memo[key] = future = Future()
+        if pending is not None:
+            content = pending.result()
+            if content is not None:
+                return ToolMessage(
+                    content=content, name=call["name"], tool_call_id=call["id"]
+                )
+            return handler(request)  # The first call failed; try again on our own.
+
+        content = None
+        try:
+            result = handler(request)
+            if isinstance(result, ToolMessage) and result.status != "error":
+                content = result.content
+            return result
+        finally:
+            # Failed calls are forgotten, so a later identical call runs the tool again.
+            future.set_result(content)
+            if content is None:
+                with self._lock:
+                    memo.pop(key, None)
+
+    def clear(self, thread_id: str):
+        """Drops every memoized result of a chat thread."""
+        with self._lock:
+            self._results.pop(thread_id, None)
+
+    def before_agent(self, state, runtime):
+        self.clear(get_config()["configurable"].get("thread_id"))
+
+    def after_agent(self, state, runtime):
+        self.clear(get_config()["configurable"].get("thread_id"))
+
+
+# Shared by every agent; results are kept apart by thread_id.
+TOOL_MEMO = ToolMemo()
+
+
+_PROMPT_TEMPLATE = """
 You are 'SportSense', a highly knowledgeable and data-driven sports analyst AI. Your goal is to provide insightful, accurate, and up-to-date answers to sports-related questions.
 **Your final answer MUST be in the following language: {language}**
-You have access to eight powerful tools to help you:
+You have access to ten powerful tools to help you:
 1.  `search_knowledge_base`: Use this for news, analysis, and context.
-2.  `query_database_stats`: Use this for hard, quantitative data (averages, match history, player recent performance).
+1b. `search_knowledge_base_batch`: Same as Tool 1 for several queries at once, e.g. `search_knowledge_base_batch(queries=["Panathinaikos injuries", "Dubai recent form"])`.
+2.  `query_database_stats`: Use this for hard, quantitative data (averages, match history, player recent performance). For a general question about a player, use `scope="full_profile"` to get all of it in one call.
+2b. `query_database_stats_bulk`: Season averages for two or more players in one call, e.g. `query_database_stats_bulk(player_names=["Harden J.", "Gilgeous-Alexander S."], metric="Points")`. Prefer it whenever a question involves several players.
 3.  `find_ambiguous_players`: **CRITICAL!** Use this immediately when the user provides an ambiguous or partial name to get a list of options.
 4.  `translate_name`: Use this as a **secondary strategy** if a primary database lookup fails, to translate the name to the target language and retry.
 5.  `improve_vector_query`: Use this to refine a conversational query before searching the knowledge base (Tool 1).
@@ -227,7 +434,7 @@ You have access to eight powerful tools to help you:
 When a user asks about key players in an upcoming match between two teams (e.g., "Which players will be key in the Panathinaikos vs Dubai match?"):
 1. **Step 1 - Get Team Rosters:** Call `get_team_key_players()` for BOTH teams to understand their top performers.
 2. **Step 2 - Compare Head-to-Head:** Call `get_head_to_head_player_stats()` with both team names to see the matchup dynamics.
-3. **Step 3 - Add Context:** Use `search_knowledge_base()` to find recent news about injuries, form, or special matchups.
+3. **Step 3 - Add Context:** Use `search_knowledge_base_batch()` with one query per team to find recent news about injuries, form, or special matchups.
 4. **Step 4 - Synthesize:** Combine the stats and news into a coherent analysis of which players are likely to be decisive.
 
 **Your General Strategy:**
@@ -239,7 +446,7 @@ When a user asks about key players in an upcoming match between two teams (e.g.,
 
 3.  **Database Retrieval with Translation Fallback:**
     a. **Attempt 1 (Direct/English/Greek):** Try `query_database_stats` with the full entity name and the **exact team name** from the database (or the user's clarification).
-    b. **Fallback:** If Attempt 1 fails (returns "Could not find a player matching..."), use `translate_name(text=original_name)` to get the {language} version.
+    b. **Fallback:** If Attempt 1 fails (returns "Could not find a player matching..."), use `translate_name(text=original_name)` to get the {language} version. Never call `translate_name` for a name that Attempt 1 already found.
     c. **Attempt 2 (Translated):** Retry `query_database_stats` with the translated name and the **original team name**.
     
 4.  **Synthesize, Don't Just Report:** Combine information into a coherent, well-written answer in **{language}**.
@@ -250,12 +457,31 @@ Today's Date is: {current_date}
 
 Begin your thought process below to answer the user's question. Use the tools available to you.
 """
-    agent = create_agent(
-        model,
-        system_prompt=prompt,
+
+
+@lru_cache(maxsize=4)
+def _system_prompt(language: str, current_date: str) -> str:
+    """Fills the agent prompt; one string per language and day."""
+    return _PROMPT_TEMPLATE.format(language=language, current_date=current_date)
+
+
+@lru_cache(maxsize=4)
+def _build_agent(language: str):
+    """Compiles the agent graph once per language."""
+
+    # The date is filled in on each model call, so a long-lived agent (or session)
+    # never answers with yesterday's date.
+    @dynamic_prompt
+    def system_prompt(request: ModelRequest) -> str:
+        return _system_prompt(language, date.today().isoformat())
+
+    return create_agent(
+        get_llm(),
         tools=[
             search_knowledge_base,
+            search_knowledge_base_batch,
             query_database_stats,
+            query_database_stats_bulk,
             find_ambiguous_players,
             translate_name,
             improve_vector_query,
@@ -263,16 +489,35 @@ Begin your thought process below to answer the user's question. Use the tools av
             get_head_to_head_player_stats,
             get_upcoming_matches,
         ],
+        middleware=[system_prompt, TOOL_MEMO],
         checkpointer=InMemorySaver(),
     )
 
-    return agent
+
+def setup_agent(language: str = LANGUAGE):
+    """Returns the shared agent for `language`; chat sessions are kept apart by thread_id."""
+    with _agent_lock:
+        return _build_agent(language)
 
 
 
 # ==================================================
 # 🖥️ Main Chat Loop
 # ==================================================
+USER_RULE = Rule(title="You", style="blue")
+
+
+def _assistant_panel() -> Panel:
+    return Panel(Text(""), title="[green]Assistant[/green]", border_style="green")
+
+
+def _model_tokens(stream):
+    """Yields the text of chunks emitted by the model node, skipping tool output."""
+    for token, metadata in stream:
+        if metadata["langgraph_node"] == "model":
+            yield token.content
+
+
 def llm_chat():
     console.print(
         Panel(
@@ -280,41 +525,66 @@ def llm_chat():
             border_style="blue",
         )
     )
-    agent = setup_agent()
+    clear_caches()
+    # Load the vector index and embedding model while the user types the first question.
+    threading.Thread(target=get_vector_store().warm_up, daemon=True).start()
+    agent = setup_agent(LANGUAGE)
+    # The agent and its checkpointer are shared, so each session gets its own thread.
+    thread_id = uuid.uuid4().hex
+    # One Panel serves every answer; each turn only resets its body.
+    panel = _assistant_panel()
 
     try:
         while True:
-            console.print(Rule(title="You", style="blue"))
-            user_input = Prompt.ask("[bold blue]You[/bold blue]")
-            if not user_input or user_input.lower() in ["quit", "exit", "q"]:
+            console.print(USER_RULE)
+            user_input = Prompt.ask("[bold blue]You[/bold blue]").strip()
+            if not user_input:
+                continue
+            if user_input.casefold() in EXIT_COMMANDS:
                 break
 
             agent_input = {
                 "messages": [{"role": "user", "content": user_input}],
             }
-            # Stream output
-            displayed = ""
-            panel = Panel(
-                Markdown(""), title="[green]Assistant[/green]", border_style="green"
-            )
+            # Stream output. Finished paragraphs are parsed as Markdown once, when a
+            # new blank line appears; the paragraph still being written is shown as
+            # plain Text, and the whole answer is parsed once more at the end. The
+            # Panel is reused; Live's refresh thread redraws its new body.
+            chunks = []
+            last_render = 0.0
+            settled_md, settled_end = None, 0
+            panel.renderable = Text("")
             with Live(panel, console=console, refresh_per_second=12) as live:
-                for token, metadata in agent.stream(
-                    agent_input,
-                    config={"thread_id": "1"},
-                    stream_mode="messages",
+                append, monotonic = chunks.append, time.monotonic
+                for text in _model_tokens(
+                    agent.stream(
+                        agent_input,
+                        config={"thread_id": thread_id},
+                        stream_mode="messages",
+                    )
                 ):
-                    if metadata["langgraph_node"] == "model":
-                        displayed += token.content
-                        live.update(
-                            Panel(
-                                Markdown(displayed),
-                                title="[green]Assistant[/green]",
-                                border_style="green",
-                            )
-                        )
+                    append(text)
+                    now = monotonic()
+                    if now - last_render < RENDER_INTERVAL:
+                        continue
+                    displayed = "".join(chunks)
+                    cut = displayed.rfind("\n\n")
+                    if cut > settled_end:
+                        settled_md, settled_end = Markdown(displayed[:cut]), cut
+                    tail = Text(displayed[settled_end:].lstrip("\n"))
+                    panel.renderable = Group(settled_md, tail) if settled_md else tail
+                    last_render = now
+                panel.renderable = Markdown("".join(chunks))
+                live.refresh()
 
     except KeyboardInterrupt:
         console.print("\n[red]Exited by user.[/red]")
+    finally:
+        # The shared InMemorySaver keeps every checkpoint of every thread; nothing can
+        # reach this session's thread again, so drop it instead of letting it pile up.
+        agent.checkpointer.delete_thread(thread_id)
+        # An interrupted turn never reaches after_agent, so its results are still held.
+        TOOL_MEMO.clear(thread_id)
     console.print("[yellow]Goodbye! May your bets be wise. 🍀[/yellow]")
 
 
@@ -1,5 +1,6 @@
 import os
 
+import httpx
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
@@ -9,9 +10,70 @@ from pydantic import BaseModel, Field
 load_dotenv()
 
 # LLM Provider Config
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").lower()
 LLM_MODEL = os.getenv("LLM_MODEL", "gemma3:4b-it-qat")
 LANGUAGE = os.getenv("LANGUAGE", "English")
+# Generation limits: a context window sized to the prompts and a cap on output tokens
+# keep the KV cache small and stop runaway generations.
+LLM_NUM_CTX = int(os.getenv("LLM_NUM_CTX", 4096))
+LLM_NUM_PREDICT = int(os.getenv("LLM_NUM_PREDICT", 1500))
+LLM_NUM_THREAD = int(os.getenv("LLM_NUM_THREAD", 0)) or None  # None: Ollama decides
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 32))
+# Seconds before a stalled request to an OpenAI-compatible server is abandoned
+# (the OpenAI client's own default).
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 600))
+# Sampling temperature for JSON-only batch jobs (see get_llm's json_mode).
+LLM_JSON_TEMPERATURE = float(os.getenv("LLM_JSON_TEMPERATURE", 0.1))
+# Response cache for batch jobs: "sqlite" (default), "redis" (uses REDIS_URL, shared
+# across processes) or "none".
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite").lower()
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".langchain_cache.db")
+
+# Keep-alive connection pool limits shared by every LLM client, so batched requests
+# reuse warm connections instead of opening a new one per call.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=LLM_MAX_CONNECTIONS // 2,
+)
+_http_client = None
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the process-wide pooled HTTP client used for OpenAI-compatible servers."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            limits=HTTP_LIMITS, timeout=httpx.Timeout(LLM_TIMEOUT, connect=5.0)
+        )
+    return _http_client
+
+
+_llm_cache = None
+
+
+def get_llm_cache():
+    """
+    Returns the process-wide LLM response cache for batch jobs (None when disabled).
+    It is passed to specific clients via get_llm(cache=...), never set globally, so
+    the chat agent always gets fresh answers. Responses are keyed by prompt and model
+    settings, so re-running a job over the same articles answers from the cache.
+    """
+    global _llm_cache
+    if _llm_cache is not None or LLM_CACHE_BACKEND == "none":
+        return _llm_cache
+    if LLM_CACHE_BACKEND == "redis":
+        import redis
+        from langchain_community.cache import RedisCache
+
+        _llm_cache = RedisCache(redis_=redis.Redis.from_url(os.getenv("REDIS_URL")))
+    elif LLM_CACHE_BACKEND == "sqlite":
+        from langchain_community.cache import SQLiteCache
+
+        _llm_cache = SQLiteCache(database_path=LLM_CACHE_PATH)
+    else:
+        raise ValueError(f"Unsupported LLM_CACHE_BACKEND: {LLM_CACHE_BACKEND}.")
+    print(f"ℹ️  LLM response cache enabled ({LLM_CACHE_BACKEND}).")
+    return _llm_cache
 
 
 # --- Centralized Pydantic Models ---
@@ -24,26 +86,62 @@ class ArticleSummary(BaseModel):
     )
 
 
+class ArticleSummaries(BaseModel):
+    """Data model for the summaries of several articles sent in one prompt."""
+
+    summaries: list[ArticleSummary] = Field(
+        description="One summary per article, in the same order as the articles."
+    )
+
+
 # --- Centralized, Flexible LLM Loader ---
-def get_llm():
+def get_llm(model: str = None, json_mode: bool = False, cache=None):
     """
     Initializes and returns the correct LLM provider based on the .env file.
 
     Args:
-        model_type (str): "main" for the primary model, "fact_checker" for a more powerful one.
+        model (str): The model to load; defaults to LLM_MODEL.
+        json_mode (bool): Constrain the output to a JSON object, sampled at
+            LLM_JSON_TEMPERATURE, for chains that only parse JSON.
+        cache: An LLM response cache for this client only (see get_llm_cache).
     """
-    provider = LLM_PROVIDER.lower()
+    provider = LLM_PROVIDER
+    model = model or LLM_MODEL
 
     # Announce which model is being initialized
-    print(f"ℹ️  Initializing LLM ({LLM_MODEL}) via provider: {provider}")
+    print(f"ℹ️  Initializing LLM ({model}) via provider: {provider}")
 
     if provider == "openai_compatible":
         return ChatOpenAI(
-            model=LLM_MODEL,
+            model=model,
             api_key=os.getenv("OPENAI_API_KEY"),
             base_url=f"{os.getenv("OPENAI_API_BASE").rstrip("/")}/v1",
+            max_tokens=LLM_NUM_PREDICT,
+            http_client=get_http_client(),
+            cache=cache,
+            **(
+                {
+                    "temperature": LLM_JSON_TEMPERATURE,
+                    "model_kwargs": {"response_format": {"type": "json_object"}},
+                }
+                if json_mode
+                else {}
+            ),
         )
     elif provider == "ollama":
-        return ChatOllama(model=LLM_MODEL)
+        # client_kwargs are passed through to the underlying httpx client.
+        return ChatOllama(
+            model=model,
+            num_ctx=LLM_NUM_CTX,
+            num_predict=LLM_NUM_PREDICT,
+            num_thread=LLM_NUM_THREAD,
+            client_kwargs={"limits": HTTP_LIMITS},
+            cache=cache,
+            **(
+                {"temperature": LLM_JSON_TEMPERATURE, "format": "json"}
+                if json_mode
+                else {}
+            ),
+        )
     else:
         raise ValueError(f"Unsupported LLM_PROVIDER: {provider}.")
@@ -1,16 +1,24 @@
 import argparse
-import json
-import math
 import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-
-from llm.llm_services import LANGUAGE, ArticleSummary, get_llm
-from storage.vector_store import VectorStoreManager
+from langchain_core.runnables import RunnableLambda
+
+from llm.llm_services import (
+    LANGUAGE,
+    LLM_NUM_CTX,
+    LLM_NUM_PREDICT,
+    ArticleSummaries,
+    ArticleSummary,
+    get_llm,
+    get_llm_cache,
+)
+from storage.vector_store import get_vector_store
 
 # --- Configuration ---
 load_dotenv()
@@ -19,16 +27,50 @@ BASE_DIR = Path(__file__).parent
 RAW_DIR = BASE_DIR / os.getenv("RAW_NEWS_DATA_DIR", "data/raw/news")
 
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", 4))
+# Short articles are summarized up to BATCH_SIZE to a prompt, so the instructions are
+# sent once per batch. Articles over BATCH_MAX_TOKENS (estimated as len // 4) go alone.
+# A batch must also fit the model's limits: the prompt, the articles and
+# SUMMARY_OUTPUT_TOKENS per summary within LLM_NUM_CTX, and the summaries within
+# LLM_NUM_PREDICT.
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", 4))
+BATCH_MAX_TOKENS = int(os.getenv("BATCH_MAX_TOKENS", 1500))
+SUMMARY_OUTPUT_TOKENS = int(os.getenv("SUMMARY_OUTPUT_TOKENS", 350))
+# How the "summary" key appears in a saved file. Inside article text a quote is
+# escaped, so this byte sequence only matches the key itself.
+SUMMARY_KEY = b'"summary":'
+# Batches made only of articles shorter than SHORT_ARTICLE_CHAR_THRESHOLD go to the
+# smaller, faster SHORT_LLM_MODEL when one is set.
+SHORT_LLM_MODEL = os.getenv("SHORT_LLM_MODEL")
+SHORT_ARTICLE_CHAR_THRESHOLD = int(os.getenv("SHORT_ARTICLE_CHAR_THRESHOLD", 1500))
 
 
 class ArticleProcessor:
     def __init__(self, language: str):
         self.language = language
+        # Compile the summary prompts and chains once, not per article or per run.
+        # Both chains only parse a JSON object, so the model is constrained to emit one.
+        # Re-runs over the same articles (or after an interrupted run) are answered
+        # from the response cache; only this processor's clients use it.
+        cache = get_llm_cache()
+        llm_client = get_llm(json_mode=True, cache=cache)
+        self.summary_chain = self._build_summary_chain(llm_client)
+        self.batch_summary_chain = self._build_batch_summary_chain(llm_client)
+        self.short_summary_chain = self.short_batch_summary_chain = None
+        if SHORT_LLM_MODEL:
+            short_llm = get_llm(SHORT_LLM_MODEL, json_mode=True, cache=cache)
+            self.short_summary_chain = self._build_summary_chain(short_llm)
+            self.short_batch_summary_chain = self._build_batch_summary_chain(short_llm)
+        # Estimated size of the batch prompt without any articles, for _group_batches.
+        self._batch_prompt_tokens = (
+            len(self.batch_summary_chain.first.format(articles="", count=BATCH_SIZE))
+            // 4
+        )
         print(
             f"✅ Initialized ArticleProcessor for language: {self.language} with {MAX_WORKERS} workers."
         )
 
-    def _summarize_content(self, content: str, llm_client) -> dict:
+    def _build_summary_chain(self, llm_client):
+        """Builds the prompt | llm | parser chain that summarizes and fact-checks an article."""
         parser = JsonOutputParser(pydantic_object=ArticleSummary)
         prompt = ChatPromptTemplate.from_template(
             """
@@ -47,82 +89,161 @@ class ArticleProcessor:
                 - **`summary`**: The final, corrected prose summary.
                 - **`highlights`**: The final, comprehensive list of highlights.
                 - **Preserve Names**: You MUST NOT translate proper nouns (player/team names). Keep them as they appear in the original article.
+                - Respond with ONLY the JSON object, no preamble and no explanation.
 
                 **Original Article**:
                 ```{content}```
                 """,
-            partial_variables={"format_instructions": parser.get_format_instructions()},
+            partial_variables={
+                "format_instructions": parser.get_format_instructions(),
+                "language": self.language,
+            },
         )
-        chain = prompt | llm_client | parser
-        return chain.invoke({"content": content, "language": self.language})
+        return prompt | llm_client | parser
+
+    def _build_batch_summary_chain(self, llm_client):
+        """Builds the chain that summarizes several numbered articles in one call."""
+        parser = JsonOutputParser(pydantic_object=ArticleSummaries)
+        prompt = ChatPromptTemplate.from_template(
+            """
+                You are an elite sports journalist and editor. Your entire response MUST be in {language}.
+                Below are {count} `Original Articles`, each wrapped in numbered markers: `[1]` ... `[/1]`, `[2]` ... `[/2]`, and so on.
+                Your task is to produce a final, verified, and comprehensive summary for EACH article, treating every article on its own.
+                You must perform all steps internally—analysis, summarization, and fact-checking—before producing a single, perfect JSON output.
+                The JSON must strictly follow this format: {format_instructions}
 
-    def _process_file(self, file_path: Path, llm_client):
-        """Processes a single article file using the provided LLM clients."""
+                **Your Internal Thought Process (Don't write this in the output, just do it), for each article:**
+                1.  Read the article to understand the main outcome, key players, and statistics.
+                2.  Mentally draft a 3-6 sentence summary.
+                3.  Mentally identify 4-10 of the most crucial highlights (top stats, game-winners, key injuries, etc.).
+                4.  **Self-Correction:** Reread your draft summary and highlights. Are they 100% supported by that article alone? Did you miss anything important? Fix any mistakes and add any omissions.
+
+                **Final Output Instructions**:
+                - **`summaries`**: Exactly {count} entries, one per article, in the same order as the articles.
+                - **`summary`**: The final, corrected prose summary of that article.
+                - **`highlights`**: The final, comprehensive list of highlights of that article.
+                - **Preserve Names**: You MUST NOT translate proper nouns (player/team names). Keep them as they appear in the original article.
+                - Respond with ONLY the JSON object, no preamble and no explanation.
+
+                **Original Articles**:
+                {articles}
+                """,
+            partial_variables={
+                "format_instructions": parser.get_format_instructions(),
+                "language": self.language,
+            },
+        )
+        return prompt | llm_client | parser
+
+    def _summarize_batch(self, contents: list[str]) -> list[dict]:
+        """
+        Summarizes several articles with one LLM call, on the short-article model when
+        they are all short. If the answer isn't valid JSON or has the wrong number of
+        summaries, they can't be matched to articles, so each is redone alone. Articles
+        that still fail get their exception in place of a summary.
+        """
+        summary_chain, batch_chain = self.summary_chain, self.batch_summary_chain
+        if self.short_summary_chain and (
+            max(map(len, contents)) < SHORT_ARTICLE_CHAR_THRESHOLD
+        ):
+            summary_chain = self.short_summary_chain
+            batch_chain = self.short_batch_summary_chain
+        if len(contents) == 1:
+            return [summary_chain.invoke({"content": contents[0]})]
+        articles = "\n\n".join(
+            f"[{i}]\n{content}\n[/{i}]" for i, content in enumerate(contents, 1)
+        )
         try:
-            print(f"Processing: {file_path.name}")
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            result = batch_chain.invoke({"articles": articles, "count": len(contents)})
+        except OutputParserException as e:
+            print(f"  ⚠️ Batch answer could not be parsed ({e}), retrying one by one.")
+        else:
+            summaries = result.get("summaries") if isinstance(result, dict) else None
+            if isinstance(summaries, list) and len(summaries) == len(contents):
+                return summaries
+            print(
+                f"  ⚠️ Batch returned {len(summaries or [])} summaries for {len(contents)} articles, retrying one by one."
+            )
+        return summary_chain.batch(
+            [{"content": c} for c in contents], return_exceptions=True
+        )
 
-            content = data.get("article", {}).get("content")
-            if not content:
-                print(f"  ⚠️ Skipping {file_path.name}, no content found.")
-                return
-            # Step 1: Generate summary
-            print("  - Generating summary...")
-            summary_and_highlights = self._summarize_content(content, llm_client)
-
-            # Step 2: Update the JSON data in memory
-            data["summary"] = summary_and_highlights.get("summary")
-            data["highlights"] = summary_and_highlights.get("highlights")
-            data["processing_status"] = "processed"
-
-            # Step 3: Write the updated data back to the original file
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"  ✅ Updated: {file_path.name}")
-        except Exception as e:
-            print(f"  ❌ FAILED to process {file_path.name}: {e}")
-
-    def _process_chunk(self, file_chunk: list[Path]):
-        """Worker function that processes a specific list (chunk) of files."""
-        # Create LLM clients ONCE for this thread/worker.
-        llm_client = get_llm()
-
-        print(f"Worker started, processing a chunk of {len(file_chunk)} files.")
-        for file_path in file_chunk:
-            self._process_file(file_path, llm_client)
+    def _group_batches(self, pending) -> list[list[int]]:
+        """
+        Groups the indexes of pending articles into batches of up to BATCH_SIZE short
+        articles; each article longer than BATCH_MAX_TOKENS gets a batch of its own.
+        A batch is closed early once the next article would overflow the context
+        window or the output cap. Articles of similar length are batched together, so
+        the shortest batches can go to the short-article model.
+        """
+        size = max(1, min(BATCH_SIZE, LLM_NUM_PREDICT // SUMMARY_OUTPUT_TOKENS))
+        budget = LLM_NUM_CTX - self._batch_prompt_tokens
+        tokens = {
+            index: len(data["article"]["content"]) // 4
+            for index, (_, data) in enumerate(pending)
+        }
+        batches, short = [], []
+        for index in sorted(tokens, key=tokens.get):
+            if tokens[index] > BATCH_MAX_TOKENS:
+                batches.append([index])
+            else:
+                short.append(index)
+        batch, used = [], 0
+        for index in short:
+            fits = used + tokens[index] + (len(batch) + 1) * SUMMARY_OUTPUT_TOKENS
+            if batch and (len(batch) == size or fits > budget):
+                batches.append(batch)
+                batch, used = [], 0
+            batch.append(index)
+            used += tokens[index]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _save_summary(self, file_path: Path, data: dict, summary_and_highlights: dict):
+        """Writes the summary and highlights back into the original article file."""
+        data["summary"] = summary_and_highlights.get("summary")
+        data["highlights"] = summary_and_highlights.get("highlights")
+        data["processing_status"] = "processed"
+
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        print(f"  ✅ Updated: {file_path.name}")
 
     def evaluate_single_file(self, file_path: Path):
         """Runs the process on a single file for evaluation."""
-        llm_client = get_llm()
-
         print("-" * 50)
         print(f"🔍 Evaluating LLM Performance for: {file_path.name}")
         print("-" * 50)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = orjson.loads(f.read())
         content = data.get("article", {}).get("content")
         if not content:
             print("❌ Cannot evaluate: No content found in file.")
             return
         # Step 1: Generate summary
         print(f"\n[1] Generating Summary in {self.language}...")
-        summary = self._summarize_content(content, llm_client)
         print("\n--- SUMMARY ---")
-        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        # The parser yields the JSON parsed so far, so the summary prints as it is written.
+        summary, shown = {}, 0
+        for summary in self.summary_chain.stream({"content": content}):
+            text = summary.get("summary") or ""
+            print(text[shown:], end="", flush=True)
+            shown = len(text)
+        print("\n\n--- FULL OUTPUT ---")
+        print(orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode("utf-8"))
 
         print("-" * 50)
 
     def process_all_articles_in_parallel(self):
         """
-        Finds unprocessed articles, manually partitions them into chunks,
-        and processes them in parallel to prevent conflicts.
+        Finds unprocessed articles and summarizes them in a single concurrent LLM batch.
         """
         print("\n--- Starting Full Article Processing (Parallel) ---")
 
         # Step 1: Use VectorStoreManager to get a list of all known article file paths.
-        vs_manager = VectorStoreManager()
+        vs_manager = get_vector_store()
         vs_manager.load()
         if not vs_manager.vector_store:
             print(
@@ -130,54 +251,74 @@ class ArticleProcessor:
             )
             return
 
-        all_known_files = [
+        # Every chunk of an article carries its file path, so de-duplicate them.
+        # Articles already flagged as summarized in the index are never opened.
+        all_known_files = dict.fromkeys(
             Path(doc.metadata["file_path"])
             for doc in vs_manager.vector_store.docstore._dict.values()
-            if "file_path" in doc.metadata
-        ]
-        # Step 2: Create a to-do list of files that need summarization.
-        files_to_process = []
+            if "file_path" in doc.metadata and not doc.metadata.get("summarized")
+        )
+        # Step 2: Create a to-do list of files that need summarization. Files found
+        # summarized on disk (e.g. before the flag existed) get flagged too.
+        pending, summarized = [], []
         for file_path in all_known_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if "summary" not in data:
-                    files_to_process.append(file_path)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+                # Summarized files are skipped on a byte probe, without parsing them.
+                if SUMMARY_KEY in raw:
+                    summarized.append(file_path)
+                    continue
+                data = orjson.loads(raw)
+            except (FileNotFoundError, orjson.JSONDecodeError) as e:
                 print(
                     f"⚠️ Skipping file from vector store index due to error: {file_path} ({e})"
                 )
+                continue
+            if "summary" in data:
+                summarized.append(file_path)
+                continue
+            if not data.get("article", {}).get("content"):
+                print(f"  ⚠️ Skipping {file_path.name}, no content found.")
+                continue
+            pending.append((file_path, data))
 
-        if not files_to_process:
+        if not pending:
+            vs_manager.mark_summarized(summarized)
             print(
                 "✅ All articles in the vector store are already summarized. Nothing to do."
             )
             return
 
-        print(f"Found {len(files_to_process)} articles needing summarization.")
+        print(f"Found {len(pending)} articles needing summarization.")
 
-        # Step 3: Determine number of workers and split work into chunks.
-        if len(files_to_process) < MAX_WORKERS:
-            num_workers = len(files_to_process)
-        else:
-            num_workers = MAX_WORKERS
-
-        if num_workers == 0:
-            return
-
-        # Split the list of files into chunks for each worker
-        chunk_size = math.ceil(len(files_to_process) / num_workers)
-        chunks = [
-            files_to_process[i : i + chunk_size]
-            for i in range(0, len(files_to_process), chunk_size)
-        ]
-
-        print(f"Splitting work into {len(chunks)} chunks for {num_workers} workers.")
-
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            # Submit each chunk to the new worker function
-            executor.map(self._process_chunk, chunks)
+        # Step 3: Pack short articles several to a prompt, then send every prompt to
+        # the LLM as one batch; LangChain runs up to MAX_WORKERS requests concurrently.
+        batches = self._group_batches(pending)
+        print(f"Sending them in {len(batches)} LLM requests.")
+        results = RunnableLambda(self._summarize_batch).batch_as_completed(
+            [[pending[i][1]["article"]["content"] for i in batch] for batch in batches],
+            config={"max_concurrency": MAX_WORKERS},
+            return_exceptions=True,
+        )
 
+        # Step 4: Write each result back to its original file as soon as its batch
+        # arrives, while the remaining requests are still in flight.
+        for batch_index, result in results:
+            for position, index in enumerate(batches[batch_index]):
+                file_path, data = pending[index]
+                summary = result if isinstance(result, Exception) else result[position]
+                if isinstance(summary, Exception):
+                    print(f"  ❌ FAILED to process {file_path.name}: {summary}")
+                    continue
+                try:
+                    self._save_summary(file_path, data, summary)
+                    summarized.append(file_path)
+                except Exception as e:
+                    print(f"  ❌ FAILED to process {file_path.name}: {e}")
+
+        # Step 5: Flag the summarized articles in the index, saving it once per run.
+        vs_manager.mark_summarized(summarized)
         print(f"\n✅ Parallel processing complete.")
 
 
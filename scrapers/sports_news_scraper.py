@@ -1,5 +1,4 @@
 import configparser
-import json
 import os
 import random
 import time
@@ -8,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from urllib.parse import urljoin
 
+import orjson
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
@@ -64,9 +64,6 @@ COMPETITION_MAPPING = {
     "superleague": "football",
 }
 
-if os.getenv("VERIFY_SSL", "false").lower() != "true":
-    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-
 # ===========================================================
 # Core Config
 # ===========================================================
@@ -80,8 +77,11 @@ HEADERS = {
 
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "15"))
 VERIFY_SSL = os.getenv("VERIFY_SSL", "false").lower() == "true"
+if not VERIFY_SSL:
+    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 DELAY_MIN = float(os.getenv("DELAY_MIN", "2"))
 DELAY_MAX = float(os.getenv("DELAY_MAX", "4"))
+LISTING_WORKERS = int(os.getenv("LISTING_WORKERS", "8"))
 
 # ===========================================================
 # Source Config Loader
@@ -144,6 +144,19 @@ def list_article_files(sport: str, competition: str):
 # ===========================================================
 # Scraper Logic
 # ===========================================================
+def fetch_listing_page(url: str):
+    """Downloads a competition listing page. Returns its HTML, or None on failure."""
+    try:
+        res = requests.get(
+            url, headers=HEADERS, timeout=REQUEST_TIMEOUT, verify=VERIFY_SSL
+        )
+        res.raise_for_status()
+        return res.text
+    except Exception as e:
+        print(f"❌ Failed to fetch {url}: {e}")
+        return None
+
+
 def scrape_article_page(article_url: str, selectors: dict):
     print(f"   📰 Fetching: {article_url}")
     try:
@@ -194,8 +207,8 @@ def save_article(article: dict, source: str, sport: str, competition: str):
         "article": article,
     }
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(file_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     print(f"   ✅ Saved: {file_path}")
 
@@ -204,21 +217,24 @@ def scrape_source(source: dict):
     name = source["name"]
     print(f"\n📡 Scraping source: {name}")
 
-    for competition, url in source["competition_urls"]:
+    # The listing pages are independent, so download them all at once; the
+    # article pages below are still fetched one by one with a polite delay.
+    competition_urls = source["competition_urls"]
+    listing_workers = max(1, min(LISTING_WORKERS, len(competition_urls)))
+    with ThreadPoolExecutor(max_workers=listing_workers) as executor:
+        listing_pages = list(
+            executor.map(fetch_listing_page, [url for _, url in competition_urls])
+        )
+
+    for (competition, url), listing_html in zip(competition_urls, listing_pages):
         sport = COMPETITION_MAPPING.get(competition, "unknown")
         print(f"\n🔍 {sport}/{competition}: {url}")
 
-        existing = list_article_files(sport, competition)
-        try:
-            res = requests.get(
-                url, headers=HEADERS, timeout=REQUEST_TIMEOUT, verify=VERIFY_SSL
-            )
-            res.raise_for_status()
-        except Exception as e:
-            print(f"❌ Failed to fetch {url}: {e}")
+        if listing_html is None:
             continue
+        existing = list_article_files(sport, competition)
 
-        soup = BeautifulSoup(res.text, "lxml")
+        soup = BeautifulSoup(listing_html, "lxml")
         link_selector = source["selectors"].get("list")
         if not link_selector:
             print(
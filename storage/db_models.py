@@ -1,8 +1,11 @@
+import unicodedata
+
 from sqlalchemy import (
     Column,
     Date,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -12,6 +15,16 @@ from sqlalchemy.orm import declarative_base, relationship
 Base = declarative_base()
 
 
+def normalize_name(name: str) -> str:
+    """Folds case, accents and final sigma, so 'ΠΑΠΑΔΟΠΟΥΛΟΣ' and 'Παπαδόπουλος' match."""
+    decomposed = unicodedata.normalize("NFKD", " ".join(name.split()))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _player_name_norm(context):
+    return normalize_name(context.get_current_parameters()["name"])
+
+
 class Sport(Base):
     __tablename__ = "sports"
     id = Column(Integer, primary_key=True)
@@ -52,13 +65,22 @@ class Player(Base):
     __tablename__ = "players"
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
+    # Folded copy of `name`, filled in on insert, so searches can use an index
+    name_norm = Column(String, nullable=False, default=_player_name_norm)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
 
     team = relationship("Team", back_populates="players")
     football_stats = relationship("FootballStats", back_populates="player")
     basketball_stats = relationship("BasketballStats", back_populates="player")
+    football_pergame = relationship("FootballPlayerPerGame", uselist=False, viewonly=True)
+    basketball_pergame = relationship(
+        "BasketballPlayerPerGame", uselist=False, viewonly=True
+    )
 
-    __table_args__ = (UniqueConstraint("name", "team_id"),)
+    __table_args__ = (
+        UniqueConstraint("name", "team_id"),
+        Index("ix_player_name_norm", "name_norm"),
+    )
 
 
 class Match(Base):
@@ -78,6 +100,9 @@ class Match(Base):
 
     __table_args__ = (
         UniqueConstraint("date", "home_team_id", "away_team_id", "competition_id"),
+        # Back a team's "last N matches": filtered on either side, sorted by date
+        Index("ix_matches_home_team_date", "home_team_id", "date"),
+        Index("ix_matches_away_team_date", "away_team_id", "date"),
     )
 
 
@@ -85,7 +110,7 @@ class FootballStats(Base):
     __tablename__ = "football_stats"
     id = Column(Integer, primary_key=True)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
 
     rating = Column(Float)
     shots = Column(Float)
@@ -133,7 +158,7 @@ class BasketballStats(Base):
     __tablename__ = "basketball_stats"
     id = Column(Integer, primary_key=True)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
 
     points = Column(Float)
     rebounds_total = Column(Float)
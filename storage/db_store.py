@@ -1,10 +1,12 @@
 import os
+import threading
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, create_engine, event, inspect, select, text
+from sqlalchemy.orm import joinedload, sessionmaker
 
 from storage.db_ingest import build_aggregates, ingest_files
 from storage.db_models import (
@@ -16,6 +18,7 @@ from storage.db_models import (
     Match,
     Player,
     Team,
+    normalize_name,
 )
 
 # ===========================================================
@@ -27,19 +30,244 @@ DB_DIR = Path(os.getenv("DB_DIR", "data/storage/db"))
 DB_PATH = DB_DIR / "stats.db"
 PROCESSED_STATS_FILES_LOG = DB_DIR / "processed_stats_files.log"
 
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", 1200))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+# Optional Redis cache for formatted stats answers, shared across processes.
+# A STATS_CACHE_TTL of 0 or less turns stats caching off.
+REDIS_URL = os.getenv("REDIS_URL")
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", 300))
+STATS_CACHE_PREFIX = "sportsense:v1:stats:"
+
+# Metric names (English or Greek) accepted by get_player_averages, mapped to the
+# per-game column they read. Built once; only the requested column is read. Keys are
+# folded with normalize_name, so 'ΠΌΝΤΟΙ', 'πόντοι' and 'ποντοι' all match.
+BASKETBALL_METRICS = {
+    "points": attrgetter("points"),
+    "ποντοι": attrgetter("points"),
+    "rebounds": attrgetter("rebounds"),
+    "ριμπαουντ": attrgetter("rebounds"),
+    "assists": attrgetter("assists"),
+    "ασιστς": attrgetter("assists"),
+    "steals": attrgetter("steals"),
+    "κλεψιματα": attrgetter("steals"),
+}
+FOOTBALL_METRICS = {
+    "rating": attrgetter("rating"),
+    "βαθμολογια": attrgetter("rating"),
+    "shots": attrgetter("shots"),
+    "σουτ": attrgetter("shots"),
+    "xg": attrgetter("xg"),
+    "duels": attrgetter("duels"),
+    "μονομαχιες": attrgetter("duels"),
+}
+BASKETBALL_METRICS = {normalize_name(k): v for k, v in BASKETBALL_METRICS.items()}
+FOOTBALL_METRICS = {normalize_name(k): v for k, v in FOOTBALL_METRICS.items()}
+
+# Full-text index over player names (external content: rows live in players).
+PLAYER_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE players_fts USING fts5(
+        name, content='players', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER players_fts_ai AFTER INSERT ON players BEGIN
+        INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER players_fts_ad AFTER DELETE ON players BEGIN
+        INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER players_fts_au AFTER UPDATE ON players BEGIN
+        INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+)
+
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+# All queries bind their values as parameters (the LIKE patterns included), so each
+# statement shape compiles once and is reused from SQLAlchemy's compiled cache.
+# The agent may run several tool calls at once; each opens its own short-lived session,
+# so the pool is sized for that (WAL, below, lets those readers proceed concurrently).
+engine = create_engine(
+    f"sqlite:///{DB_PATH}",
+    echo=False,
+    future=True,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    # Pooled connections get handed to whichever thread runs the next tool call
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_POOL_SIZE * 2,
+)
+
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_connection, _connection_record):
+    """
+    Tunes every new connection for the read-heavy chat tools: WAL lets readers run
+    alongside ingestion, and a bigger page cache plus mmap keep indexes in memory.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.close()
+
+
+# Sessions are opened per call (`with self.SessionLocal() as session`). The tool reads
+# never need autoflush, and ingestion flushes explicitly in _get_or_create.
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+
+
+# Player lookups eager-load everything the stats answers read: team, sport and only
+# the per-game averages that get_player_averages reports.
+PLAYER_LOADS = (
+    joinedload(Player.team).joinedload(Team.sport),
+    joinedload(Player.basketball_pergame).load_only(
+        BasketballPlayerPerGame.points,
+        BasketballPlayerPerGame.rebounds,
+        BasketballPlayerPerGame.assists,
+        BasketballPlayerPerGame.steals,
+    ),
+    joinedload(Player.football_pergame).load_only(
+        FootballPlayerPerGame.rating,
+        FootballPlayerPerGame.shots,
+        FootballPlayerPerGame.xg,
+        FootballPlayerPerGame.duels,
+    ),
+)
+
+
+def _name_lookup(model, *options) -> Dict:
+    """
+    Builds the name-lookup statements for `model` once, with bound parameters, so each
+    call only binds values and SQLAlchemy's compiled cache always hits. Models with a
+    `name_norm` column are searched on it, so "fold" maps the input to the same form.
+    """
+    folded = hasattr(model, "name_norm")
+    key = model.name_norm if folded else model.name
+    first = select(model).options(*options).limit(1)
+    return {
+        "exact": first.where(model.name == bindparam("name")),
+        "prefix": first.where(key >= bindparam("key"), key < bindparam("key_end")),
+        "id": first.where(model.id == bindparam("id")),
+        "contains": first.where(key.like(bindparam("pattern"))),
+        "fold": normalize_name if folded else str,
+    }
+
+
+PLAYER_LOOKUP = _name_lookup(Player, *PLAYER_LOADS)
+TEAM_LOOKUP = _name_lookup(Team, joinedload(Team.sport))
+PLAYERS_BY_NAMES = (
+    select(Player)
+    .options(*PLAYER_LOADS)
+    .where(Player.name.in_(bindparam("names", expanding=True)))
+)
+PLAYER_FTS_SEARCH = text(
+    "SELECT rowid FROM players_fts WHERE players_fts MATCH :terms "
+    "ORDER BY rank LIMIT :limit"
+)
 
 
 class DBStore:
     def __init__(self):
         self.engine = engine
         self.SessionLocal = SessionLocal
+        # Bumped after every ingest so callers caching query results can tell they're stale.
+        self.data_version = 0
+        self._averages_by_sport = {
+            "basketball": self._basketball_averages,
+            "football": self._football_averages,
+        }
+        self.redis = None
+        if REDIS_URL:
+            import redis  # Only needed when a Redis cache is configured
+
+            self.redis = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        # Readers never run DDL; migrations happen in init_db(), i.e. on ingest.
+        self._player_fts = False
+        self._check_schema()
 
     def init_db(self):
         Base.metadata.create_all(self.engine)
+        self.ensure_indexes()
+
+    def _check_schema(self):
+        """
+        Read-only check of whether ensure_indexes() has migrated this database. Without
+        the players_fts index, name searches fall back to LIKE scans.
+        """
+        inspector = inspect(self.engine)
+        if not inspector.has_table("players"):
+            return
+        self._player_fts = inspector.has_table("players_fts")
+        columns = {c["name"] for c in inspector.get_columns("players")}
+        if "name_norm" not in columns or not self._player_fts:
+            print(
+                "⚠️ The stats database predates the current schema; run the DB ingest to migrate it."
+            )
+
+    def ensure_indexes(self):
+        """
+        Adds the indexes declared in db_models to tables created before they were
+        declared; create_all() only builds indexes together with new tables.
+        """
+        inspector = inspect(self.engine)
+        if inspector.has_table("players"):
+            self._ensure_player_name_norm(inspector)
+        for table in Base.metadata.sorted_tables:
+            if inspector.has_table(table.name):
+                for index in table.indexes:
+                    index.create(self.engine, checkfirst=True)
+        if inspector.has_table("players"):
+            self._ensure_player_search()
+            self._player_fts = True
+
+    def _ensure_player_name_norm(self, inspector):
+        """
+        Adds players.name_norm to databases created before it existed and fills it in
+        for every row that lacks it (new rows get it from the column default).
+        """
+        with self.engine.begin() as conn:
+            columns = {c["name"] for c in inspector.get_columns("players")}
+            if "name_norm" not in columns:
+                conn.execute(
+                    text(
+                        "ALTER TABLE players "
+                        "ADD COLUMN name_norm TEXT NOT NULL DEFAULT ''"
+                    )
+                )
+            rows = conn.execute(
+                text("SELECT id, name FROM players WHERE name_norm = ''")
+            ).all()
+            if rows:
+                conn.execute(
+                    text("UPDATE players SET name_norm = :name_norm WHERE id = :id"),
+                    [{"id": i, "name_norm": normalize_name(name)} for i, name in rows],
+                )
+
+    def _ensure_player_search(self):
+        """
+        Creates the players_fts full-text index over player names, kept in sync with
+        the players table by triggers, so partial-name searches are token lookups
+        instead of '%name%' table scans.
+        """
+        with self.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'players_fts'")
+            ).first()
+            if exists:
+                return
+            for statement in PLAYER_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO players_fts(players_fts) VALUES ('rebuild')"))
 
     def run(self):
         self.init_db()
@@ -48,22 +276,112 @@ class DBStore:
             session.commit()
             build_aggregates(session)
             session.commit()
+            self.data_version += 1
+            self.clear_cache()
             print("Done.")
 
-    def get_players_by_surname(self, surname: str) -> List[Dict[str, str]]:
+    def cached(self, key: str, compute) -> str:
+        """
+        Cache-aside read through Redis: returns the cached answer for `key`, or computes
+        and stores it for STATS_CACHE_TTL seconds. Without Redis (or if it is
+        unreachable), or with a STATS_CACHE_TTL of 0 or less, it just computes.
+        """
+        if not self.redis or STATS_CACHE_TTL <= 0:
+            return compute()
+        key = STATS_CACHE_PREFIX + key
+        try:
+            value = self.redis.get(key)
+            if value is not None:
+                return value
+        except Exception as e:
+            print(f"⚠️ Redis cache unavailable: {e}")
+            return compute()
+        value = compute()
+        try:
+            self.redis.setex(key, STATS_CACHE_TTL, value)
+        except Exception as e:
+            print(f"⚠️ Could not write to the Redis cache: {e}")
+        return value
+
+    def clear_cache(self):
+        """Drops every cached stats answer from Redis, e.g. after new data is ingested."""
+        if self.redis:
+            keys = list(self.redis.scan_iter(f"{STATS_CACHE_PREFIX}*", count=1000))
+            if keys:
+                self.redis.unlink(*keys)
+
+    def _team_names(self, session, team_ids) -> Dict[int, str]:
+        """Fetches the names of all given teams in one query, as an {id: name} dict."""
+        return dict(
+            session.query(Team.id, Team.name).filter(Team.id.in_(set(team_ids))).all()
+        )
+
+    def _first_by_name(self, session, lookup: Dict, name: str, search=None):
+        """
+        Returns the first row whose name equals, then starts with, then contains `name`,
+        running the prebuilt statements in `lookup`. The first two use an index (the
+        prefix as a range, since SQLite's case-insensitive LIKE can't). Before the
+        substring scan, `search` (a name -> ids function) may offer full-text matches.
+        """
+        key = lookup["fold"](name)
+        row = (
+            session.scalars(lookup["exact"], {"name": name}).first()
+            or session.scalars(
+                lookup["prefix"], {"key": key, "key_end": key + "\U0010ffff"}
+            ).first()
+        )
+        if row:
+            return row
+        if search:
+            ids = search(session, name, 1)
+            if ids:
+                return session.scalars(lookup["id"], {"id": ids[0]}).first()
+        return session.scalars(lookup["contains"], {"pattern": f"%{key}%"}).first()
+
+    def _search_player_ids(self, session, name: str, limit: int) -> List[int]:
+        """
+        Ranks players whose name has tokens starting with each word of `name`, using
+        the players_fts index.
+        """
+        terms = " ".join('"{}"*'.format(word.replace('"', '""')) for word in name.split())
+        if not terms or not self._player_fts:
+            return []
+        return session.scalars(PLAYER_FTS_SEARCH, {"terms": terms, "limit": limit}).all()
+
+    def _find_player(self, session, player_name: str):
+        """Finds the first player matching the name, with their team, sport and averages."""
+        return self._first_by_name(
+            session, PLAYER_LOOKUP, player_name, search=self._search_player_ids
+        )
+
+    def _find_team(self, session, team_name: str):
+        """Finds the first team matching the name, loading its sport with it."""
+        return self._first_by_name(session, TEAM_LOOKUP, team_name)
+
+    def get_players_by_surname(
+        self, surname: str, limit: int = 10
+    ) -> List[Dict[str, str]]:
         """
         Searches for players based on a (potentially ambiguous) surname or partial name.
-        Returns a list of players, their teams, and their sport.
+        Returns a list of up to `limit` players, their teams, and their sport.
         """
         with self.SessionLocal() as session:
-            search_term = f"%{surname}%"
-            players = (
-                session.query(Player)
-                .join(Team)
-                .filter(Player.name.like(search_term))
-                .limit(10)  # Limit for performance
-                .all()
+            query = session.query(Player).options(
+                joinedload(Player.team).joinedload(Team.sport)
             )
+            # Full-text token match first; the '%surname%' scan only runs when that
+            # finds nothing (e.g. a fragment from the middle of a name).
+            player_ids = self._search_player_ids(session, surname, limit)
+            if player_ids:
+                players = query.filter(Player.id.in_(player_ids)).all()
+                players.sort(key=lambda p: player_ids.index(p.id))
+            else:
+                players = (
+                    query.join(Team)
+                    .filter(Player.name_norm.like(f"%{normalize_name(surname)}%"))
+                    .limit(limit)  # Limit for performance
+                    .all()
+                )
 
             results = []
             for player in players:
@@ -84,207 +402,214 @@ class DBStore:
         """Retrieves the score and opponents for a team's last X matches."""
         with self.SessionLocal() as session:
             # 1. Find the Team
-            team = session.query(Team).filter(Team.name.like(f"%{team_name}%")).first()
+            team = self._find_team(session, team_name)
             if not team:
                 return f"Could not find a team matching '{team_name}'."
-
-            # 2. Query the Match history, ordered by date descending
-            matches = (
-                session.query(Match)
-                .filter(
-                    (Match.home_team_id == team.id) | (Match.away_team_id == team.id)
-                )
-                .order_by(Match.date.desc())
-                .limit(limit)
-                .all()
-            )
-
-            if not matches:
-                return f"Found team '{team.name}', but no match history is available."
-
-            # 3. Format the results
-            results = [
-                f"**Last {len(matches)} matches for {team.name} ({team.sport.name}):**"
-            ]
-            for match in matches:
-                # Fetch the names of the opposing teams
-                home_team = (
-                    session.query(Team).filter(Team.id == match.home_team_id).first()
-                )
-                away_team = (
-                    session.query(Team).filter(Team.id == match.away_team_id).first()
-                )
-
-                home_name = home_team.name if home_team else "Unknown Home"
-                away_name = away_team.name if away_team else "Unknown Away"
-
-                # Determine the score/opponent from the perspective of the queried team
-                if match.home_team_id == team.id:
-                    score = f"{match.home_score} - {match.away_score}"
-                    opponent_name = away_name
-                    result = (
-                        "Νίκη (W)"
-                        if match.home_score > match.away_score
-                        else (
-                            "Ήττα (L)"
-                            if match.home_score < match.away_score
-                            else "Ισοπαλία (D)"
-                        )
+            return self._team_last_matches(session, team, limit)
+
+    def _team_last_matches(self, session, team, limit: int) -> str:
+        # 2. Query the Match history, ordered by date descending
+        matches = (
+            session.query(Match)
+            .filter((Match.home_team_id == team.id) | (Match.away_team_id == team.id))
+            .order_by(Match.date.desc())
+            .limit(limit)
+            .all()
+        )
+
+        if not matches:
+            return f"Found team '{team.name}', but no match history is available."
+
+        # 3. Format the results
+        results = [
+            f"**Last {len(matches)} matches for {team.name} ({team.sport.name}):**"
+        ]
+        # Fetch the names of every team involved once, instead of two queries per match
+        team_names = self._team_names(
+            session,
+            [m.home_team_id for m in matches] + [m.away_team_id for m in matches],
+        )
+        for match in matches:
+            home_name = team_names.get(match.home_team_id, "Unknown Home")
+            away_name = team_names.get(match.away_team_id, "Unknown Away")
+
+            # Determine the score/opponent from the perspective of the queried team
+            if match.home_team_id == team.id:
+                score = f"{match.home_score} - {match.away_score}"
+                opponent_name = away_name
+                result = (
+                    "Νίκη (W)"
+                    if match.home_score > match.away_score
+                    else (
+                        "Ήττα (L)"
+                        if match.home_score < match.away_score
+                        else "Ισοπαλία (D)"
                     )
-                else:
-                    score = f"{match.away_score} - {match.home_score}"  # Flip score to be from team's perspective
-                    opponent_name = home_name
-                    result = (
-                        "Νίκη (W)"
-                        if match.away_score > match.home_score
-                        else (
-                            "Ήττα (L)"
-                            if match.away_score < match.home_score
-                            else "Ισοπαλία (D)"
-                        )
+                )
+            else:
+                score = f"{match.away_score} - {match.home_score}"  # Flip score to be from team's perspective
+                opponent_name = home_name
+                result = (
+                    "Νίκη (W)"
+                    if match.away_score > match.home_score
+                    else (
+                        "Ήττα (L)"
+                        if match.away_score < match.home_score
+                        else "Ισοπαλία (D)"
                     )
-
-                results.append(
-                    f" - {match.date.strftime('%Y-%m-%d')} vs {opponent_name}: **{result} {score}**"
                 )
 
-            return "\n".join(results)
+            results.append(
+                f" - {match.date.strftime('%Y-%m-%d')} vs {opponent_name}: **{result} {score}**"
+            )
+
+        return "\n".join(results)
 
     def get_player_last_games(self, player_name: str, limit: int = 5) -> str:
         """Retrieves a player's individual stats for their last X matches."""
         with self.SessionLocal() as session:
             # 1. Find the Player and Sport
-            player = (
-                session.query(Player)
-                .filter(Player.name.like(f"%{player_name}%"))
-                .first()
-            )
+            player = self._find_player(session, player_name)
             if not player:
                 return f"Could not find a player matching '{player_name}'."
-
-            sport_name = (
-                player.team.sport.name.lower()
-                if player.team and player.team.sport
-                else "unknown"
+            return self._player_last_games(session, player, limit)
+
+    def _player_last_games(self, session, player, limit: int) -> str:
+        sport_name = (
+            player.team.sport.name.lower()
+            if player.team and player.team.sport
+            else "unknown"
+        )
+
+        results = [
+            f"**{player.name}'s individual performance in the last {limit} games ({sport_name.capitalize()}):**"
+        ]
+
+        if "basketball" in sport_name:
+            stats_data = (
+                session.query(BasketballStats, Match)
+                .join(Match, BasketballStats.match_id == Match.id)
+                .filter(BasketballStats.player_id == player.id)
+                .order_by(Match.date.desc())
+                .limit(limit)
+                .all()
             )
-
-            results = [
-                f"**{player.name}'s individual performance in the last {limit} games ({sport_name.capitalize()}):**"
-            ]
-
-            if "basketball" in sport_name:
-                stats_data = (
-                    session.query(BasketballStats, Match)
-                    .join(Match, BasketballStats.match_id == Match.id)
-                    .filter(BasketballStats.player_id == player.id)
-                    .order_by(Match.date.desc())
-                    .limit(limit)
-                    .all()
+            team_names = self._team_names(
+                session,
+                [m.home_team_id for _, m in stats_data]
+                + [m.away_team_id for _, m in stats_data],
+            )
+            for stats, match in stats_data:
+                is_home = match.home_team_id == player.team_id
+                opponent_id = match.away_team_id if is_home else match.home_team_id
+                results.append(
+                    f" - {match.date.strftime('%Y-%m-%d')} vs {team_names.get(opponent_id, 'Unknown')}: "
+                    f"**Πόντοι**: {stats.points or 'N/A'}, **Ριμπ**: {stats.rebounds_total or 'N/A'}, **Ασιστ**: {stats.assists or 'N/A'}, **Λεπτά**: {stats.minutes or 'N/A'}"
                 )
-                for stats, match in stats_data:
-                    is_home = match.home_team_id == player.team_id
-                    opponent_id = match.away_team_id if is_home else match.home_team_id
-                    opponent = (
-                        session.query(Team).filter(Team.id == opponent_id).first()
-                    )
-                    results.append(
-                        f" - {match.date.strftime('%Y-%m-%d')} vs {opponent.name}: "
-                        f"**Πόντοι**: {stats.points or 'N/A'}, **Ριμπ**: {stats.rebounds_total or 'N/A'}, **Ασιστ**: {stats.assists or 'N/A'}, **Λεπτά**: {stats.minutes or 'N/A'}"
-                    )
 
-            elif "football" in sport_name:
-                stats_data = (
-                    session.query(FootballStats, Match)
-                    .join(Match, FootballStats.match_id == Match.id)
-                    .filter(FootballStats.player_id == player.id)
-                    .order_by(Match.date.desc())
-                    .limit(limit)
-                    .all()
+        elif "football" in sport_name:
+            stats_data = (
+                session.query(FootballStats, Match)
+                .join(Match, FootballStats.match_id == Match.id)
+                .filter(FootballStats.player_id == player.id)
+                .order_by(Match.date.desc())
+                .limit(limit)
+                .all()
+            )
+            team_names = self._team_names(
+                session,
+                [m.home_team_id for _, m in stats_data]
+                + [m.away_team_id for _, m in stats_data],
+            )
+            for stats, match in stats_data:
+                is_home = match.home_team_id == player.team_id
+                opponent_id = match.away_team_id if is_home else match.home_team_id
+                results.append(
+                    f" - {match.date.strftime('%Y-%m-%d')} vs {team_names.get(opponent_id, 'Unknown')}: "
+                    f"**Βαθμολ.** (Rating): {stats.rating or 'N/A'}, **Σουτ** (Shots): {stats.shots or 'N/A'}, **xG**: {stats.xg or 'N/A'}"
                 )
-                for stats, match in stats_data:
-                    is_home = match.home_team_id == player.team_id
-                    opponent_id = match.away_team_id if is_home else match.home_team_id
-                    opponent = (
-                        session.query(Team).filter(Team.id == opponent_id).first()
-                    )
-                    results.append(
-                        f" - {match.date.strftime('%Y-%m-%d')} vs {opponent.name}: "
-                        f"**Βαθμολ.** (Rating): {stats.rating or 'N/A'}, **Σουτ** (Shots): {stats.shots or 'N/A'}, **xG**: {stats.xg or 'N/A'}"
-                    )
-            else:
-                return f"Individual game analysis is not supported for the sport '{sport_name}'."
+        else:
+            return f"Individual game analysis is not supported for the sport '{sport_name}'."
 
-            return "\n".join(results)
+        return "\n".join(results)
 
     def get_player_averages(self, player_name: str, metric: str = "all") -> str:
         with self.SessionLocal() as session:
-            player = (
-                session.query(Player)
-                .filter(Player.name.like(f"%{player_name}%"))
-                .first()
-            )
+            player = self._find_player(session, player_name)
 
             if not player:
                 return f"Could not find a player matching '{player_name}' for average stats."
+            return self._player_averages(session, player, metric)
 
-            sport_name = (
-                player.team.sport.name.lower()
-                if player.team and player.team.sport
-                else "unknown"
-            )
+    def get_players_averages(self, player_names: List[str], metric: str = "all") -> str:
+        """
+        Retrieves season averages for several players in one session. Names that match
+        exactly are fetched together with one IN query; the rest are resolved one by one.
+        """
+        with self.SessionLocal() as session:
+            names = list(dict.fromkeys(" ".join(n.split()) for n in player_names))
+            exact = {
+                p.name: p for p in session.scalars(PLAYERS_BY_NAMES, {"names": names})
+            }
+            sections = []
+            for name in names:
+                player = exact.get(name) or self._find_player(session, name)
+                if player:
+                    sections.append(self._player_averages(session, player, metric))
+                else:
+                    sections.append(
+                        f"Could not find a player matching '{name}' for average stats."
+                    )
+            return "\n".join(sections)
+
+    def _player_averages(self, session, player, metric: str) -> str:
+        sport_name = (
+            player.team.sport.name.lower()
+            if player.team and player.team.sport
+            else "unknown"
+        )
+        # One dict probe picks the sport's formatter; it returns None for an unknown metric.
+        handler = self._averages_by_sport.get(sport_name)
+        answer = handler(player, normalize_name(metric), metric) if handler else None
+        return answer or f"Averages are not supported for the sport '{sport_name}'."
+
+    def _basketball_averages(self, player, metric_key: str, metric: str):
+        stats = player.basketball_pergame
+        if not stats:
+            return f"No basketball averages found for {player.name}."
+
+        if metric_key == "all":
+            return f"🏀 **{player.name}** Μέσος Όρος (Averages): Πόντοι: {stats.points}, Ριμπάουντ: {stats.rebounds}, Ασίστ: {stats.assists}, Κλεψίματα: {stats.steals}"
+        elif metric_key in BASKETBALL_METRICS:
+            return f"🏀 **{player.name}** {metric.capitalize()} ανά παιχνίδι: {BASKETBALL_METRICS[metric_key](stats) or 'N/A'}"
+
+    def _football_averages(self, player, metric_key: str, metric: str):
+        stats = player.football_pergame
+        if not stats:
+            return f"No football averages found for {player.name}."
+
+        if metric_key == "all":
+            return f"⚽ **{player.name}** Μέσος Όρος (Averages): Βαθμολογία (Rating): {stats.rating}, Σουτ (Shots): {stats.shots}, xG: {stats.xg}"
+        elif metric_key in FOOTBALL_METRICS:
+            return f"⚽ **{player.name}** {metric.capitalize()} ανά παιχνίδι: {FOOTBALL_METRICS[metric_key](stats) or 'N/A'}"
+
+    def get_player_profile(self, player_name: str, limit: int = 5) -> str:
+        """
+        Retrieves a player's season averages, their last X games and their team's last
+        X matches, resolving the player once and reusing a single session.
+        """
+        with self.SessionLocal() as session:
+            player = self._find_player(session, player_name)
+            if not player:
+                return f"Could not find a player matching '{player_name}'."
 
-            # Basketball Averages Logic
-            if "basketball" in sport_name:
-                stats = (
-                    session.query(BasketballPlayerPerGame)
-                    .filter(BasketballPlayerPerGame.player_id == player.id)
-                    .first()
-                )
-                if not stats:
-                    return f"No basketball averages found for {player.name}."
-
-                metric_map = {
-                    "points": stats.points,
-                    "ποντοι": stats.points,
-                    "rebounds": stats.rebounds,
-                    "ριμπαουντ": stats.rebounds,
-                    "assists": stats.assists,
-                    "ασιστς": stats.assists,
-                    "steals": stats.steals,
-                    "κλεψιματα": stats.steals,
-                }
-
-                if metric.lower() == "all":
-                    return f"🏀 **{player.name}** Μέσος Όρος (Averages): Πόντοι: {stats.points}, Ριμπάουντ: {stats.rebounds}, Ασίστ: {stats.assists}, Κλεψίματα: {stats.steals}"
-                elif metric.lower() in metric_map:
-                    return f"🏀 **{player.name}** {metric.capitalize()} ανά παιχνίδι: {metric_map[metric.lower()] or 'N/A'}"
-
-            # Football Averages Logic
-            elif "football" in sport_name:
-                stats = (
-                    session.query(FootballPlayerPerGame)
-                    .filter(FootballPlayerPerGame.player_id == player.id)
-                    .first()
-                )
-                if not stats:
-                    return f"No football averages found for {player.name}."
-
-                metric_map = {
-                    "rating": stats.rating,
-                    "βαθμολογια": stats.rating,
-                    "shots": stats.shots,
-                    "σουτ": stats.shots,
-                    "xg": stats.xg,
-                    "duels": stats.duels,
-                    "μονομαχιες": stats.duels,
-                }
-
-                if metric.lower() == "all":
-                    return f"⚽ **{player.name}** Μέσος Όρος (Averages): Βαθμολογία (Rating): {stats.rating}, Σουτ (Shots): {stats.shots}, xG: {stats.xg}"
-                elif metric.lower() in metric_map:
-                    return f"⚽ **{player.name}** {metric.capitalize()} ανά παιχνίδι: {metric_map[metric.lower()] or 'N/A'}"
-
-            return f"Averages are not supported for the sport '{sport_name}'."
+            sections = [
+                self._player_averages(session, player, "all"),
+                self._player_last_games(session, player, limit),
+            ]
+            if player.team:
+                sections.append(self._team_last_matches(session, player.team, limit))
+            return "\n\n".join(sections)
 
     def _get_basketball_key_players(
         self, team_id: int, limit: int
@@ -349,7 +674,7 @@ class DBStore:
         """
         with self.SessionLocal() as session:
             # 1. Find the Team
-            team = session.query(Team).filter(Team.name.like(f"%{team_name}%")).first()
+            team = self._find_team(session, team_name)
             if not team:
                 return f"Could not find a team matching '{team_name}'."
 
@@ -392,8 +717,8 @@ class DBStore:
         """
         with self.SessionLocal() as session:
             # 1. Find both teams
-            team1 = session.query(Team).filter(Team.name.like(f"%{team1_name}%")).first()
-            team2 = session.query(Team).filter(Team.name.like(f"%{team2_name}%")).first()
+            team1 = self._find_team(session, team1_name)
+            team2 = self._find_team(session, team2_name)
 
             if not team1:
                 return f"Could not find team '{team1_name}'."
@@ -424,15 +749,11 @@ class DBStore:
             results = [
                 f"📋 **Matches between {team1.name} and {team2.name}:**"
             ]
+            # Every match is between these two teams, so their names are already known
+            team_names = {team1.id: team1.name, team2.id: team2.name}
             for match in matches:
-                home_team = (
-                    session.query(Team).filter(Team.id == match.home_team_id).first()
-                )
-                away_team = (
-                    session.query(Team).filter(Team.id == match.away_team_id).first()
-                )
                 results.append(
-                    f" - {match.date.strftime('%Y-%m-%d')}: {home_team.name} vs {away_team.name} ({match.home_score}-{match.away_score})"
+                    f" - {match.date.strftime('%Y-%m-%d')}: {team_names[match.home_team_id]} vs {team_names[match.away_team_id]} ({match.home_score}-{match.away_score})"
                 )
 
             return "\n".join(results)
@@ -552,8 +873,8 @@ class DBStore:
         """
         with self.SessionLocal() as session:
             # 1. Find both teams
-            team1 = session.query(Team).filter(Team.name.like(f"%{team1_name}%")).first()
-            team2 = session.query(Team).filter(Team.name.like(f"%{team2_name}%")).first()
+            team1 = self._find_team(session, team1_name)
+            team2 = self._find_team(session, team2_name)
 
             if not team1:
                 return f"Could not find team '{team1_name}'."
@@ -584,6 +905,21 @@ class DBStore:
             return "\n".join(results)
 
 
+_db_store = None
+_db_store_lock = threading.Lock()
+
+
+def get_db_store() -> DBStore:
+    """Returns the process-wide DBStore shared by the CLI and the chat tools."""
+    global _db_store
+    if _db_store is None:
+        # Parallel tool calls may ask first at the same moment; build it only once.
+        with _db_store_lock:
+            if _db_store is None:
+                _db_store = DBStore()
+    return _db_store
+
+
 if __name__ == "__main__":
     store = DBStore()
     store.run()
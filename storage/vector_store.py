@@ -1,11 +1,13 @@
 import argparse
-import json
 import os
 import shutil
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+import orjson
 from dotenv import load_dotenv
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
@@ -23,6 +25,7 @@ EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1000))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 150))
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", 32))
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 1024))
 
 PROCESSED_FILES_LOG = VECTOR_DIR / "processed_news_files.log"
 
@@ -40,6 +43,10 @@ class VectorStoreManager:
             chunk_overlap=CHUNK_OVERLAP,
             length_function=len,
         )
+        # Skips the embedding request and the index search for repeated queries;
+        # cleared whenever the index changes.
+        self._query_cached = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._search)
+        self._load_lock = threading.Lock()
         VECTOR_DIR.mkdir(parents=True, exist_ok=True)
         print(f"✅ Initialized VectorStoreManager with model '{EMBEDDING_MODEL}'.")
         print(f"   Chunk size: {CHUNK_SIZE}, Overlap: {CHUNK_OVERLAP}")
@@ -82,8 +89,8 @@ class VectorStoreManager:
 
         for file_path in new_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(file_path, "rb") as f:
+                    data = orjson.loads(f.read())
 
                 article = data.get("article")
                 if not article or not article.get("content", "").strip():
@@ -142,6 +149,7 @@ class VectorStoreManager:
                 f"  ...embedded batch {i//BATCH_SIZE + 1}/{(len(new_chunks) - 1)//BATCH_SIZE + 1}"
             )
 
+        self._query_cached.cache_clear()
         print("💾 Saving updated vector store to disk...")
         self.vector_store.save_local(str(VECTOR_DIR))
 
@@ -191,6 +199,7 @@ class VectorStoreManager:
         else:
             print(f"🔍 Found {len(ids_to_delete)} document chunks to remove.")
             self.vector_store.delete(ids_to_delete)
+            self._query_cached.cache_clear()
             print("💾 Saving synchronized vector store to disk...")
             self.vector_store.save_local(str(VECTOR_DIR))
             print("✅ Unwanted entries removed from vector store.")
@@ -208,10 +217,31 @@ class VectorStoreManager:
 
         print("✅ Synchronization complete.")
 
+    def mark_summarized(self, file_paths) -> None:
+        """
+        Flags every chunk of the given articles as summarized in the docstore metadata
+        and saves the index once, so the article processor can skip them without
+        opening their files.
+        """
+        if not self.vector_store or not file_paths:
+            return
+        paths = set(map(Path, file_paths))
+        for doc in self.vector_store.docstore._dict.values():
+            file_path = doc.metadata.get("file_path")
+            if file_path and Path(file_path) in paths:
+                doc.metadata["summarized"] = True
+        print(f"💾 Flagging {len(paths)} summarized articles in the vector store...")
+        self.vector_store.save_local(str(VECTOR_DIR))
+
     def load(self) -> None:
         """Loads the FAISS index from disk."""
         if self.vector_store:
             return
+        with self._load_lock:
+            if not self.vector_store:
+                self._load_from_disk()
+
+    def _load_from_disk(self) -> None:
         if VECTOR_DIR.exists() and any(VECTOR_DIR.iterdir()):
             try:
                 print(f"ℹ️ Loading vector store from {VECTOR_DIR}...")
@@ -236,24 +266,78 @@ class VectorStoreManager:
             print("❌ Vector store is not available. Cannot query.")
             return []
 
+        # Unfiltered queries are memoized (filters are dicts, so they can't be keys).
+        if filters is None:
+            return self._query_cached(query_text, k)
+        return self._search(query_text, k, filters)
+
+    def _search(
+        self, query_text: str, k: int, filters: Optional[Dict] = None
+    ) -> List[Dict[str, Any]]:
         results_with_scores = self.vector_store.similarity_search_with_score(
             query_text, k=k, filter=filters
         )
 
-        formatted_results = []
-        for doc, score in results_with_scores:
-            result = {
+        formatted_results = self._format_results(results_with_scores)
+        print(f"🔍 Found {len(formatted_results)} results for your query.")
+        return formatted_results
+
+    def query_batch(
+        self, query_texts: List[str], k: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Queries the vector store for several texts at once. All queries are embedded
+        in a single request, then each vector is searched against the index.
+        """
+        self.load()
+        if not self.vector_store:
+            print("❌ Vector store is not available. Cannot query.")
+            return [[] for _ in query_texts]
+        if not query_texts:
+            return []
+
+        vectors = self.embeddings.embed_documents(query_texts)
+        batch_results = [
+            self._format_results(
+                self.vector_store.similarity_search_with_score_by_vector(
+                    vector, k=k, filter=filters
+                )
+            )
+            for vector in vectors
+        ]
+
+        print(
+            f"🔍 Found {sum(map(len, batch_results))} results for {len(query_texts)} queries."
+        )
+        return batch_results
+
+    @staticmethod
+    def _format_results(results_with_scores) -> List[Dict[str, Any]]:
+        """Converts (Document, score) pairs into plain result dicts."""
+        return [
+            {
                 "score": score,
                 "content": doc.page_content,
                 "metadata": doc.metadata,
             }
-            formatted_results.append(result)
+            for doc, score in results_with_scores
+        ]
 
-        print(f"🔍 Found {len(formatted_results)} results for your query.")
-        return formatted_results
+    def warm_up(self) -> None:
+        """
+        Loads the index and has the embedding server load its model, so the first real
+        query doesn't pay for either. Failures are ignored; the query path reports them.
+        """
+        try:
+            self.load()
+            self.embeddings.embed_query("warm up")
+        except Exception as e:
+            print(f"⚠️ Vector store warm-up failed: {e}")
 
     def clear(self) -> None:
         """Deletes the vector store and processed files log."""
+        self.vector_store = None
+        self._query_cached.cache_clear()
         if VECTOR_DIR.exists():
             shutil.rmtree(VECTOR_DIR)
             print(f"🗑️ Deleted vector store directory: {VECTOR_DIR}")
@@ -263,6 +347,24 @@ class VectorStoreManager:
         print("✨ Cleared all existing data. Ready for a fresh start.")
 
 
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStoreManager:
+    """
+    Returns the process-wide VectorStoreManager, so the embedding model and the FAISS
+    index are loaded only once no matter how many modules use them.
+    """
+    global _vector_store
+    if _vector_store is None:
+        # Parallel tool calls may ask first at the same moment; build it only once.
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = VectorStoreManager()
+    return _vector_store
+
+
 # ===========================================================
 # Main Execution
 # ===========================================================